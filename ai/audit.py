@@ -0,0 +1,191 @@
+
+from __future__ import annotations
+import atexit, glob, gzip, json, os, shutil, statistics, threading, time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from config.run import run_id
+
+AI_AUDIT_LOG = os.getenv("AI_AUDIT_LOG", "artifacts/ai_audit.log")
+AI_AUDIT_FLUSH_EVERY = int(os.getenv("AI_AUDIT_FLUSH_EVERY", "50"))
+AI_AUDIT_FLUSH_SEC = float(os.getenv("AI_AUDIT_FLUSH_SEC", "2"))
+AI_AUDIT_MAX_BYTES = int(float(os.getenv("AI_AUDIT_MAX_MB", "20")) * 1024 * 1024)
+AI_AUDIT_BACKUPS = int(os.getenv("AI_AUDIT_BACKUPS", "5"))
+
+def worker_id() -> str:
+    return os.getenv("PYTEST_XDIST_WORKER") or f"pid{os.getpid()}"
+
+def _rotate(path: Path, backups: int) -> None:
+    """path -> path.1.gz, shifting older archives up and dropping the oldest."""
+    oldest = path.with_name(f"{path.name}.{backups}.gz")
+    oldest.unlink(missing_ok=True)
+    for i in range(backups - 1, 0, -1):
+        src = path.with_name(f"{path.name}.{i}.gz")
+        if src.exists():
+            os.replace(src, path.with_name(f"{path.name}.{i + 1}.gz"))
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.gz.tmp")
+    with open(path, "rb") as src, gzip.open(tmp, "wb", compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst)
+    os.replace(tmp, path.with_name(f"{path.name}.1.gz"))
+    path.unlink()
+
+class AuditSink:
+    """Buffered JSONL writer for AI audit entries.
+
+    Each process appends to its own ``<stem>.<run>.<worker><suffix>``
+    next to the main log, so xdist workers never interleave writes;
+    ``merge()`` folds this run's files, including any gzip segments they
+    rotated out, into the main log at session end and leaves those of
+    other runs sharing the directory alone.  Lines are
+    buffered and written every ``flush_every`` entries or
+    ``flush_interval_sec`` (and at exit); a file reaching ``max_bytes``
+    is rotated to gzip archives ``.1.gz`` .. ``.<backups>.gz``.
+    """
+
+    def __init__(self, path: str | os.PathLike = AI_AUDIT_LOG, flush_every: int = AI_AUDIT_FLUSH_EVERY,
+                 flush_interval_sec: float = AI_AUDIT_FLUSH_SEC, max_bytes: int = AI_AUDIT_MAX_BYTES,
+                 backups: int = AI_AUDIT_BACKUPS):
+        self.path = Path(path)
+        self.enabled = str(path) != os.devnull
+        self.flush_every = flush_every
+        self.flush_interval_sec = flush_interval_sec
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._pending: List[str] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    @property
+    def worker_path(self) -> Path:
+        return self.path.with_name(f"{self.path.stem}.{run_id()}.{worker_id()}{self.path.suffix}")
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            self._pending.append(line)
+            due = (len(self._pending) >= self.flush_every
+                   or time.monotonic() - self._last_flush >= self.flush_interval_sec)
+        if due:
+            self.flush()
+
+    def _append(self, path: Path, data: bytes) -> None:
+        if path.exists() and path.stat().st_size + len(data) > self.max_bytes:
+            _rotate(path, self.backups)
+        with open(path, "ab") as f:
+            f.write(data)
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._pending:
+                return
+            lines, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._append(self.worker_path, ("\n".join(lines) + "\n").encode("utf-8"))
+
+    def worker_logs(self) -> List[Path]:
+        """This run's per-worker logs."""
+        prefix = glob.escape(f"{self.path.stem}.{run_id()}.")
+        return sorted(self.path.parent.glob(f"{prefix}*{glob.escape(self.path.suffix)}"))
+
+    @staticmethod
+    def archives(log: Path) -> List[Path]:
+        """Gzip segments rotated out of ``log``, oldest first."""
+        prefix = f"{log.name}."
+        found = [p for p in log.parent.glob(f"{glob.escape(prefix)}*.gz") if p.name[len(prefix):-3].isdigit()]
+        return sorted(found, key=lambda p: -int(p.name[len(prefix):-3]))
+
+    def merge(self) -> int:
+        """Append every per-worker log and its archives to the main log; call with no writers running."""
+        self.flush()
+        merged = 0
+        for log in self.worker_logs():
+            for segment in self.archives(log) + [log]:
+                opener = gzip.open if segment.suffix == ".gz" else open
+                with opener(segment, "rb") as f:
+                    data = f.read()
+                if data and not data.endswith(b"\n"):
+                    data = data[:data.rfind(b"\n") + 1]  # torn final line from a killed worker
+                if data:
+                    self._append(self.path, data)
+                    merged += data.count(b"\n")
+                segment.unlink()
+        return merged
+
+    def files(self, rotated: bool = True) -> List[Path]:
+        """Main log, this run's unmerged worker logs and (optionally) their gzip archives."""
+        logs = self.worker_logs()
+        paths = [self.path] + logs
+        if rotated:
+            for log in [self.path] + logs:
+                paths += self.archives(log)
+        return [p for p in paths if p.exists()]
+
+    def entries(self, rotated: bool = True, **match: Any) -> Iterator[Dict[str, Any]]:
+        """Audit entries whose fields equal ``match`` (e.g. ``run=...``, ``model=...``)."""
+        self.flush()
+        for path in self.files(rotated):
+            opener = gzip.open if path.suffix == ".gz" else open
+            with opener(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if all(entry.get(k) == v for k, v in match.items()):
+                        yield entry
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return float(values[0])
+    return statistics.quantiles(values, n=100, method="inclusive")[int(pct) - 1]
+
+def summarize(entries: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Calls, error rate, p50/p95 latency and cost by model for audit entries of model calls.
+
+    Cache hits and calls refused by an open circuit never reach the model:
+    they are counted in ``cache_hits`` and ``rejected`` instead of ``calls``.
+    """
+    calls = errors = cache_hits = rejected = 0
+    latencies: List[float] = []
+    cost_by_model: Dict[str, float] = {}
+    for e in entries:
+        if "latency_ms" not in e or e.get("disabled"):
+            continue  # cache bookkeeping events and disabled AI, not calls
+        if e.get("cached"):
+            cache_hits += 1
+            continue
+        if e.get("rejected"):
+            rejected += 1
+            continue
+        calls += 1
+        errors += 1 if e.get("error") else 0
+        latencies.append(e["latency_ms"])
+        model = e.get("model", "?")
+        cost_by_model[model] = cost_by_model.get(model, 0.0) + float(e.get("cost_usd") or 0.0)
+    return {
+        "calls": calls,
+        "errors": errors,
+        "error_rate": errors / calls if calls else 0.0,
+        "cache_hits": cache_hits,
+        "rejected": rejected,
+        "p50_latency_ms": _percentile(latencies, 50),
+        "p95_latency_ms": _percentile(latencies, 95),
+        "cost_by_model": cost_by_model,
+    }
+
+_sinks: Dict[str, AuditSink] = {}
+_sinks_lock = threading.Lock()
+
+def sink(path: Optional[str] = None) -> AuditSink:
+    """Process-wide sink for ``path`` (default AI_AUDIT_LOG)."""
+    key = str(path or AI_AUDIT_LOG)
+    with _sinks_lock:
+        if key not in _sinks:
+            _sinks[key] = AuditSink(key)
+        return _sinks[key]
@@ -0,0 +1,152 @@
+
+from __future__ import annotations
+import contextvars, os, sqlite3, threading, time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from config.run import run_id
+
+AI_BUDGET_LEDGER = os.getenv("AI_BUDGET_LEDGER", "artifacts/ai_budget.sqlite")
+# Rows of older runs are dropped when a new run starts.
+AI_BUDGET_KEEP_SEC = float(os.getenv("AI_BUDGET_KEEP_DAYS", "7")) * 86400
+
+_FEATURE: contextvars.ContextVar[str] = contextvars.ContextVar("ai_feature", default="other")
+
+@contextmanager
+def feature(name: str) -> Iterator[None]:
+    """Attribute AI spend inside the block to ``name`` (e.g. "triage", "locator_explain")."""
+    token = _FEATURE.set(name)
+    try:
+        yield
+    finally:
+        _FEATURE.reset(token)
+
+def current_feature() -> str:
+    return _FEATURE.get()
+
+class BudgetLedger:
+    """Run-wide AI budget shared by every provider instance and xdist worker.
+
+    Spend lives in a sqlite file keyed by run id.  A call first
+    ``reserve()``s its worst-case cost -- atomically refused when committed
+    plus in-flight reservations would pass the ceiling -- then ``commit()``s
+    the actual cost or ``refund()``s on failure.  ``check``/``add``/
+    ``spent``/``exhausted`` cover callers that just record a known cost.
+    """
+
+    def __init__(self, ceiling_usd: float, path: str = AI_BUDGET_LEDGER):
+        self.ceiling = max(0.0, ceiling_usd)
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS ledger (id INTEGER PRIMARY KEY, run TEXT, feature TEXT,"
+                " amount REAL, state TEXT, ts REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ledger_run ON ledger (run, state)")
+            self._conn = conn
+        return self._conn
+
+    def _used(self, db: sqlite3.Connection) -> float:
+        row = db.execute("SELECT COALESCE(SUM(amount), 0) FROM ledger WHERE run=? AND state IN ('held', 'committed')",
+                         (run_id(),)).fetchone()
+        return row[0]
+
+    def reserve(self, amount: float, feature_name: Optional[str] = None) -> Optional[int]:
+        """Hold ``amount`` USD; returns a reservation id, or None when it does not fit."""
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")  # serializes reservations across processes
+            try:
+                if self._used(db) + amount > self.ceiling + 1e-9:
+                    db.execute("ROLLBACK")
+                    return None
+                cur = db.execute("INSERT INTO ledger (run, feature, amount, state, ts) VALUES (?, ?, ?, 'held', ?)",
+                                 (run_id(), feature_name or current_feature(), max(0.0, amount), time.time()))
+                db.execute("COMMIT")
+                return cur.lastrowid
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def commit(self, reservation: int, actual: float) -> None:
+        with self._lock:
+            self._db().execute("UPDATE ledger SET amount=?, state='committed', ts=? WHERE id=?",
+                               (max(0.0, actual), time.time(), reservation))
+
+    def refund(self, reservation: int) -> None:
+        with self._lock:
+            self._db().execute("UPDATE ledger SET state='refunded', ts=? WHERE id=?", (time.time(), reservation))
+
+    def check(self, planned_cost: float) -> bool:
+        with self._lock:
+            return self._used(self._db()) + planned_cost <= self.ceiling + 1e-9
+
+    def add(self, cost: float) -> None:
+        with self._lock:
+            self._db().execute("INSERT INTO ledger (run, feature, amount, state, ts) VALUES (?, ?, ?, 'committed', ?)",
+                               (run_id(), current_feature(), max(0.0, cost), time.time()))
+
+    @property
+    def spent(self) -> float:
+        with self._lock:
+            row = self._db().execute("SELECT COALESCE(SUM(amount), 0) FROM ledger WHERE run=? AND state='committed'",
+                                     (run_id(),)).fetchone()
+        return row[0]
+
+    @property
+    def remaining(self) -> float:
+        with self._lock:
+            return max(0.0, self.ceiling - self._used(self._db()))
+
+    @property
+    def exhausted(self) -> bool:
+        with self._lock:
+            used = self._used(self._db())
+        return used > 0 and used >= self.ceiling - 1e-9
+
+    def report(self) -> Dict[str, object]:
+        """Spend for this run: totals, in-flight holds and per-feature breakdown."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT feature, state, COUNT(*), COALESCE(SUM(amount), 0) FROM ledger WHERE run=? GROUP BY feature, state",
+                (run_id(),)).fetchall()
+        features: Dict[str, Dict[str, float]] = {}
+        held = spent = 0.0
+        for name, state, calls, amount in rows:
+            if state == "committed":
+                entry = features.setdefault(name, {"calls": 0, "cost_usd": 0.0})
+                entry["calls"] += calls
+                entry["cost_usd"] += amount
+                spent += amount
+            elif state == "held":
+                held += amount
+        return {"run": run_id(), "ceiling_usd": self.ceiling, "spent_usd": spent, "held_usd": held,
+                "remaining_usd": max(0.0, self.ceiling - spent - held), "features": features}
+
+    def prune(self, max_age_sec: float = AI_BUDGET_KEEP_SEC) -> None:
+        with self._lock:
+            self._db().execute("DELETE FROM ledger WHERE ts < ?", (time.time() - max_age_sec,))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+_ledger: Optional[BudgetLedger] = None
+_ledger_lock = threading.Lock()
+
+def ledger(ceiling_usd: float) -> BudgetLedger:
+    """The process-wide ledger; the first caller's ceiling (AI_BUDGET_USD) wins."""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = BudgetLedger(ceiling_usd)
+        return _ledger
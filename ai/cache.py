@@ -0,0 +1,80 @@
+
+from __future__ import annotations
+import hashlib, json, os, sqlite3, threading, time
+from typing import Any, Optional
+
+AI_CACHE_PATH = os.getenv("AI_CACHE_PATH", "artifacts/ai_cache.sqlite")
+
+# Failures and the offline stub's canned text are never cached.
+UNCACHEABLE_PREFIXES = ("[AI ", "[openai-like disabled", "[STUB AI]")
+
+def cache_key(*parts: Any) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def provider_name(provider: Any) -> str:
+    """Class name of the provider that answers, looking through a CachedProvider."""
+    return type(getattr(provider, "inner", provider)).__name__
+
+def cacheable(text: str) -> bool:
+    return not (text or "").startswith(UNCACHEABLE_PREFIXES)
+
+class ResponseCache:
+    """Persistent TTL + LRU cache of JSON values in a shared sqlite file.
+
+    Each namespace (e.g. ``explain``) is bounded to ``max_entries`` rows,
+    evicting the least recently used.  WAL mode lets xdist workers read and
+    write the same file concurrently.
+    """
+
+    def __init__(self, namespace: str, ttl_sec: float, max_entries: int, path: str = AI_CACHE_PATH):
+        self.namespace = namespace
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (ns TEXT, key TEXT, value TEXT, created REAL, accessed REAL,"
+                " PRIMARY KEY (ns, key))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_lru ON cache (ns, accessed)")
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT value, created FROM cache WHERE ns=? AND key=?", (self.namespace, key)).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl_sec:
+                db.execute("DELETE FROM cache WHERE ns=? AND key=?", (self.namespace, key))
+                return None
+            db.execute("UPDATE cache SET accessed=? WHERE ns=? AND key=?", (now, self.namespace, key))
+        return json.loads(row[0])
+
+    def put(self, key: str, value: dict) -> None:
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)",
+                       (self.namespace, key, json.dumps(value), now, now))
+            db.execute(
+                "DELETE FROM cache WHERE ns=? AND key IN (SELECT key FROM cache WHERE ns=?"
+                " ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.namespace, self.namespace, self.max_entries),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
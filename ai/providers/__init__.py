@@ -2,12 +2,16 @@
 from __future__ import annotations
 import os
 from .base import AI_ENABLED, AI_PROVIDER
-from . import stub, openai_like
+from . import cached, stub, openai_like
 
-def get_provider():
+def _select():
     if not AI_ENABLED:
         return stub.get()
     prov = os.getenv("AI_PROVIDER", AI_PROVIDER).lower()
     if prov in ("openai", "openai_like", "openai-like"):
         return openai_like.get()
     return stub.get()
+
+def get_provider():
+    prov = _select()
+    return cached.wrap(prov) if cached.AI_CACHE else prov
@@ -1,8 +1,13 @@
 
 from __future__ import annotations
-import os, time, json
+import asyncio, os, time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from ai.audit import AI_AUDIT_LOG, sink as audit_sink
+from ai.budget import ledger
+from config.run import run_id
 
 # Env switches
 AI_ENABLED = os.getenv("AI_ENABLED", "1") == "1"
@@ -10,7 +15,9 @@ AI_PROVIDER = os.getenv("AI_PROVIDER", "stub")
 AI_MODEL = os.getenv("AI_MODEL", "gpt-4o-mini")
 AI_MAX_TOKENS = int(os.getenv("AI_MAX_TOKENS", "600"))
 AI_TIMEOUT_SEC = int(os.getenv("AI_TIMEOUT_SEC", "30"))
+AI_TEMPERATURE = float(os.getenv("AI_TEMPERATURE", "0"))
 AI_BUDGET_USD = float(os.getenv("AI_BUDGET_USD", "0.50"))
+AI_CONCURRENCY = int(os.getenv("AI_CONCURRENCY", "4"))
 
 @dataclass
 class AIResponse:
@@ -19,26 +26,18 @@ class AIResponse:
     completion_tokens: int = 0
     cost_usd: float = 0.0
     latency_ms: int = 0
-
-class Budget:
-    def __init__(self, ceiling_usd: float):
-        self.ceiling = max(0.0, ceiling_usd)
-        self.spent = 0.0
-
-    def check(self, planned_cost: float) -> bool:
-        return (self.spent + planned_cost) <= self.ceiling + 1e-9
-
-    def add(self, cost: float) -> None:
-        self.spent += max(0.0, cost)
+    error: Optional[str] = None  # set when the call failed, timed out or was refused by the budget
+    cached: bool = False
 
 class AIProvider(ABC):
     def __init__(self):
         self.enabled = AI_ENABLED
         self.model = AI_MODEL
         self.max_tokens = AI_MAX_TOKENS
+        self.temperature = AI_TEMPERATURE
         self.timeout = AI_TIMEOUT_SEC
-        self.budget = Budget(AI_BUDGET_USD)
-        self.audit_log_path = os.getenv("AI_AUDIT_LOG", "artifacts/ai_audit.log")
+        self.budget = ledger(AI_BUDGET_USD)
+        self.audit_log_path = AI_AUDIT_LOG
         os.makedirs("artifacts", exist_ok=True)
 
     def redact(self, text: str) -> str:
@@ -49,12 +48,54 @@ class AIProvider(ABC):
         return text
 
     def audit(self, entry: dict) -> None:
+        entry.setdefault("run", run_id())
         try:
-            with open(self.audit_log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            audit_sink(self.audit_log_path).write(entry)
         except Exception:
             pass
 
     @abstractmethod
     def chat(self, prompt: str, system: str | None = None) -> AIResponse:
         ...
+
+    async def achat(self, prompt: str, system: str | None = None) -> AIResponse:
+        """Non-blocking chat; providers without native async I/O run ``chat`` in a thread."""
+        return await asyncio.to_thread(self.chat, prompt, system)
+
+    async def aclose(self) -> None:
+        """Release async resources bound to the running event loop."""
+
+    async def achat_many(self, prompts: Sequence[str], system: str | None = None,
+                         concurrency: int = AI_CONCURRENCY, timeout: Optional[float] = None) -> List[AIResponse]:
+        """Run many prompts concurrently, at most ``concurrency`` in flight.
+
+        Results are in input order.  A prompt that raises or exceeds
+        ``timeout`` seconds gets an ``[AI error]`` response with ``error``
+        set instead of failing the batch; once the budget is spent, prompts
+        that have not started yet are not sent.
+        """
+        sem = asyncio.Semaphore(max(1, concurrency))
+        timeout = self.timeout if timeout is None else timeout
+
+        async def one(prompt: str) -> AIResponse:
+            async with sem:
+                if self.budget.exhausted:
+                    return AIResponse(text="[AI budget exhausted]", error="budget exhausted")
+                t0 = time.time()
+                try:
+                    return await asyncio.wait_for(self.achat(prompt, system), timeout)
+                except Exception as e:
+                    err = f"timed out after {timeout}s" if isinstance(e, asyncio.TimeoutError) else str(e) or type(e).__name__
+                    return AIResponse(text=f"[AI error] {err}", latency_ms=int((time.time() - t0) * 1000), error=err)
+
+        return list(await asyncio.gather(*(one(p) for p in prompts)))
+
+    def chat_many(self, prompts: Sequence[str], system: str | None = None,
+                  concurrency: int = AI_CONCURRENCY, timeout: Optional[float] = None) -> List[AIResponse]:
+        """Blocking wrapper around ``achat_many``; call it from code without a running event loop."""
+        async def run() -> List[AIResponse]:
+            try:
+                return await self.achat_many(prompts, system, concurrency, timeout)
+            finally:
+                await self.aclose()
+        return asyncio.run(run())
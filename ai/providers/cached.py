@@ -0,0 +1,70 @@
+
+from __future__ import annotations
+import os, time
+import weakref
+
+from ai.cache import ResponseCache, cache_key, cacheable, provider_name
+from ai.registry import PROMPT_VERSION
+from .base import AIProvider, AIResponse
+
+# Opt-in: AI_CACHE=1 answers repeated prompts from artifacts/ai_cache.sqlite.
+AI_CACHE = os.getenv("AI_CACHE", "0") == "1"
+AI_CACHE_TTL_SEC = float(os.getenv("AI_CACHE_TTL_SEC", str(7 * 24 * 3600)))
+AI_CACHE_MAX = int(os.getenv("AI_CACHE_MAX", "5000"))
+
+class CachedProvider(AIProvider):
+    """Wraps a provider and serves identical requests from the response cache.
+
+    The key covers provider, model, system prompt, prompt, temperature,
+    max_tokens and PROMPT_VERSION.  Hits cost nothing and are flagged with
+    ``cached=True``; failed or refused calls are never stored.
+    """
+
+    def __init__(self, inner: AIProvider, cache: ResponseCache | None = None):
+        super().__init__()
+        self.inner = inner
+        self.model = inner.model
+        self.budget = inner.budget
+        self.cache = cache or ResponseCache("chat", ttl_sec=AI_CACHE_TTL_SEC, max_entries=AI_CACHE_MAX)
+
+    def _key(self, prompt: str, system: str | None) -> str:
+        inner = self.inner
+        return cache_key(provider_name(inner), inner.model, system, prompt, inner.temperature, inner.max_tokens,
+                         PROMPT_VERSION)
+
+    def _lookup(self, key: str, t0: float) -> AIResponse | None:
+        hit = self.cache.get(key)
+        if hit is None:
+            return None
+        dt = int((time.time() - t0) * 1000)
+        self.audit({"provider": "cache", "model": self.model, "cost_usd": 0.0, "latency_ms": dt, "cached": True,
+                    "saved_cost_usd": hit["cost_usd"], "ts": time.time()})
+        return AIResponse(text=hit["text"], prompt_tokens=hit["prompt_tokens"], completion_tokens=hit["completion_tokens"],
+                          cost_usd=0.0, latency_ms=dt, cached=True)
+
+    def _store(self, key: str, resp: AIResponse) -> AIResponse:
+        if resp.error is None and cacheable(resp.text):
+            self.cache.put(key, {"text": resp.text, "prompt_tokens": resp.prompt_tokens,
+                                 "completion_tokens": resp.completion_tokens, "cost_usd": resp.cost_usd})
+        return resp
+
+    def chat(self, prompt: str, system: str | None = None) -> AIResponse:
+        t0 = time.time()
+        key = self._key(prompt, system)
+        return self._lookup(key, t0) or self._store(key, self.inner.chat(prompt, system))
+
+    async def achat(self, prompt: str, system: str | None = None) -> AIResponse:
+        t0 = time.time()
+        key = self._key(prompt, system)
+        return self._lookup(key, t0) or self._store(key, await self.inner.achat(prompt, system))
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+_wrapped: "weakref.WeakKeyDictionary[AIProvider, CachedProvider]" = weakref.WeakKeyDictionary()
+
+def wrap(provider: AIProvider) -> CachedProvider:
+    cached = _wrapped.get(provider)
+    if cached is None:
+        cached = _wrapped[provider] = CachedProvider(provider)
+    return cached
@@ -1,8 +1,30 @@
 
 from __future__ import annotations
-import os, time, json
+import asyncio, atexit, importlib.util, os, threading, time, json, weakref
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import httpx
 from .base import AIProvider, AIResponse
+from .resilience import CircuitBreaker, LatencyTracker, backoff_delay, retry_after, retryable
+
+# Connection pool: one keep-alive client per provider, created on first call.
+AI_HTTP_MAX_CONNECTIONS = int(os.getenv("AI_HTTP_MAX_CONNECTIONS", "10"))
+AI_HTTP_MAX_KEEPALIVE = int(os.getenv("AI_HTTP_MAX_KEEPALIVE", "10"))
+AI_HTTP_KEEPALIVE_SEC = float(os.getenv("AI_HTTP_KEEPALIVE_SEC", "60"))
+# HTTP/2 needs the optional `h2` package (pip install httpx[http2]).
+AI_HTTP2 = os.getenv("AI_HTTP2", "0") == "1" and importlib.util.find_spec("h2") is not None
+
+# Retries for 429/5xx/transport errors with full-jitter backoff; Retry-After is
+# honoured up to AI_RETRY_MAX_SEC (a longer requested wait fails the call).
+AI_RETRIES = int(os.getenv("AI_RETRIES", "2"))
+AI_RETRY_BASE_SEC = float(os.getenv("AI_RETRY_BASE_SEC", "0.5"))
+AI_RETRY_MAX_SEC = float(os.getenv("AI_RETRY_MAX_SEC", "20"))
+# Consecutive failed calls before failing fast, and how long to stay open (0 disables).
+AI_BREAKER_THRESHOLD = int(os.getenv("AI_BREAKER_THRESHOLD", "5"))
+AI_BREAKER_COOLDOWN_SEC = float(os.getenv("AI_BREAKER_COOLDOWN_SEC", "30"))
+# Hedging: send a second request when the first outlives the recent p95 latency.
+# Off by default -- a hedged call can be billed twice.
+AI_HEDGE = os.getenv("AI_HEDGE", "0") == "1"
+AI_HEDGE_MIN_MS = float(os.getenv("AI_HEDGE_MIN_MS", "50"))
 
 # Simple price table (USD per 1K tokens). Add/adjust as needed.
 PRICE = {
@@ -17,54 +39,287 @@ class OpenAILikeProvider(AIProvider):
         self.api_key = os.getenv("AI_API_KEY") or os.getenv("OPENAI_API_KEY", "")
         self.base_url = os.getenv("AI_BASE_URL", "https://api.openai.com/v1")
         self.model = os.getenv("AI_MODEL", self.model)
+        self._client: httpx.Client | None = None
+        self._client_lock = threading.Lock()
+        # httpx.AsyncClient is bound to the loop it first ran on, so keep one per loop.
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = \
+            weakref.WeakKeyDictionary()
+        self.retries = AI_RETRIES
+        self.hedge = AI_HEDGE
+        self.breaker = CircuitBreaker(AI_BREAKER_THRESHOLD, AI_BREAKER_COOLDOWN_SEC)
+        self.latency = LatencyTracker()
+        self.sleep = time.sleep  # retry backoff; tests swap in a recorder
+        self._hedge_pool: ThreadPoolExecutor | None = None
+
+    def _client_args(self) -> dict:
+        return {
+            "timeout": self.timeout,
+            "http2": AI_HTTP2,
+            "limits": httpx.Limits(max_connections=AI_HTTP_MAX_CONNECTIONS,
+                                   max_keepalive_connections=AI_HTTP_MAX_KEEPALIVE,
+                                   keepalive_expiry=AI_HTTP_KEEPALIVE_SEC),
+        }
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = httpx.Client(**self._client_args())
+                    atexit.register(self.close)
+        return self._client
+
+    def close(self) -> None:
+        with self._client_lock:
+            client, self._client = self._client, None
+            pool, self._hedge_pool = self._hedge_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+        if client is not None:
+            client.close()
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._async_clients[loop] = httpx.AsyncClient(**self._client_args())
+        return client
+
+    async def aclose(self) -> None:
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
 
     def _estimate_cost(self, in_tok: int, out_tok: int) -> float:
         p = PRICE.get(self.model, {"input": 0.0, "output": 0.0})
         return (in_tok/1000.0)*p["input"] + (out_tok/1000.0)*p["output"]
 
-    def chat(self, prompt: str, system: str | None = None) -> AIResponse:
-        t0 = time.time()
+    def _prepare(self, prompt: str, system: str | None, t0: float) -> tuple[AIResponse | None, dict, int | None]:
+        """Payload and budget reservation, or an immediate response when no call should be made."""
         if not self.api_key:
             # fall back to a local no-cost response
             text = "[openai-like disabled: missing API key] " + (prompt[:200] if prompt else "")
             dt = int((time.time() - t0) * 1000)
             self.audit({"provider":"openai_like","model":self.model,"cost_usd":0.0,"latency_ms":dt,"disabled":True,"ts":time.time()})
-            return AIResponse(text=text, prompt_tokens=0, completion_tokens=len(text)//4, cost_usd=0.0, latency_ms=dt)
+            return AIResponse(text=text, prompt_tokens=0, completion_tokens=len(text)//4, cost_usd=0.0, latency_ms=dt), {}, None
 
-        headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
         payload = {
             "model": self.model,
             "messages": ([{"role":"system","content":system}] if system else []) + [{"role":"user","content":prompt}],
             "max_tokens": self.max_tokens,
-            "temperature": float(os.getenv("AI_TEMPERATURE", "0")),
+            "temperature": self.temperature,
         }
-        # Rough pre-check: assume prompt token count as len(prompt)//4
-        est_in = max(1, len(prompt)//4)
-        if not self.budget.check(self._estimate_cost(est_in, self.max_tokens)):
-            return AIResponse(text="[AI budget exhausted]", prompt_tokens=0, completion_tokens=0, cost_usd=0.0, latency_ms=int((time.time()-t0)*1000))
+        reservation = self.budget.reserve(self._worst_case_cost(prompt))
+        if reservation is None:
+            return AIResponse(text="[AI budget exhausted]", prompt_tokens=0, completion_tokens=0, cost_usd=0.0,
+                              latency_ms=int((time.time()-t0)*1000), error="budget exhausted"), payload, None
+        return None, payload, reservation
+
+    def _headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+
+    def _worst_case_cost(self, prompt: str) -> float:
+        # Reserved up front: prompt tokens estimated as len(prompt)//4, full max_tokens out.
+        return self._estimate_cost(max(1, len(prompt)//4), self.max_tokens)
+
+    def _usage(self, data: dict, prompt: str) -> tuple[str, int, int, float]:
+        text = data["choices"][0]["message"]["content"]
+        usage = data.get("usage", {})
+        in_tok = usage.get("prompt_tokens", max(1, len(prompt)//4))
+        out_tok = usage.get("completion_tokens", max(1, len(text)//4))
+        return text, in_tok, out_tok, self._estimate_cost(in_tok, out_tok)
+
+    def _settle_extra(self, reservation: int, prompt: str, request) -> None:
+        """Charge a hedge's second reservation with the request whose answer was not used."""
+        if not request.done() or request.cancelled():
+            # abandoned mid-flight: the provider may still bill it in full
+            self.budget.commit(reservation, self._worst_case_cost(prompt))
+        elif request.exception() is not None:
+            self.budget.refund(reservation)
+        else:
+            self.budget.commit(reservation, self._usage(request.result().json(), prompt)[3])
+
+    def _complete(self, data: dict, prompt: str, t0: float, reservation: int, info: dict) -> AIResponse:
+        text, in_tok, out_tok, cost = self._usage(data, prompt)
+        self.budget.commit(reservation, cost)
+        dt = int((time.time() - t0) * 1000)
+        self.audit({"provider":"openai_like","model":self.model,"cost_usd":cost,"latency_ms":dt,"usage":{"in":in_tok,"out":out_tok},**info,"ts":time.time()})
+        return AIResponse(text=text, prompt_tokens=in_tok, completion_tokens=out_tok, cost_usd=cost, latency_ms=dt)
+
+    def _failed(self, e: Exception, t0: float, reservation: int, info: dict | None = None) -> AIResponse:
+        self.budget.refund(reservation)
+        dt = int((time.time() - t0) * 1000)
+        self.audit({"provider":"openai_like","model":self.model,"error":str(e),"latency_ms":dt,**(info or {}),"ts":time.time()})
+        return AIResponse(text=f"[AI error] {e}", prompt_tokens=0, completion_tokens=0, cost_usd=0.0, latency_ms=dt,
+                          error=str(e) or type(e).__name__)
+
+    def _rejected(self, t0: float, reservation: int) -> AIResponse:
+        self.budget.refund(reservation)
+        dt = int((time.time() - t0) * 1000)
+        self.audit({"provider":"openai_like","model":self.model,"error":"circuit open","rejected":True,"latency_ms":dt,"ts":time.time()})
+        return AIResponse(text="[AI error] circuit open", latency_ms=dt, error="circuit open")
 
+    def _hedge_delay(self) -> float | None:
+        p95 = self.latency.p95() if self.hedge else None
+        return None if p95 is None else max(p95, AI_HEDGE_MIN_MS) / 1000
+
+    def _retry_wait(self, e: Exception, attempt: int) -> float | None:
+        """Seconds to wait before retry ``attempt`` (0-based), or None to give up."""
+        if attempt >= self.retries or not retryable(e):
+            return None
+        requested = retry_after(e)
+        if requested is not None:
+            return requested if requested <= AI_RETRY_MAX_SEC else None
+        return backoff_delay(attempt, AI_RETRY_BASE_SEC, AI_RETRY_MAX_SEC)
+
+    def _post(self, payload: dict) -> httpx.Response:
+        t0 = time.perf_counter()
+        r = self.client.post(f"{self.base_url}/chat/completions", headers=self._headers(), json=payload)
+        r.raise_for_status()
+        self.latency.add((time.perf_counter() - t0) * 1000)
+        return r
+
+    def _post_hedged(self, payload: dict, info: dict) -> httpx.Response:
+        delay = self._hedge_delay()
+        if delay is None:
+            return self._post(payload)
+        with self._client_lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(max_workers=2 * AI_HTTP_MAX_CONNECTIONS,
+                                                      thread_name_prefix="ai-hedge")
+            pool = self._hedge_pool
+        first = pool.submit(self._post, payload)
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
+        # The second copy is billed too, so it needs its own room in the budget.
+        prompt = payload["messages"][-1]["content"]
+        extra = self.budget.reserve(self._worst_case_cost(prompt))
+        if extra is None:
+            return first.result()
+        info["hedged"] = True
+        second = pool.submit(self._post, payload)
+        done, _ = wait([first, second], return_when=FIRST_COMPLETED)
+        winner = next(iter(done))
+        other = second if winner is first else first
+        if winner.exception() is not None:  # the other request may still succeed
+            self._settle_extra(extra, prompt, winner)
+            return other.result()
+        if other.cancel():  # never sent
+            self.budget.refund(extra)
+        else:  # a running request can't be interrupted; charge what it turns out to cost
+            other.add_done_callback(lambda f: self._settle_extra(extra, prompt, f))
+        return winner.result()
+
+    def _send(self, payload: dict, info: dict) -> httpx.Response:
+        """POST with hedging and retries; raises the last error."""
+        attempt = 0
+        while True:
+            info["attempts"] = attempt + 1
+            try:
+                return self._post_hedged(payload, info)
+            except Exception as e:
+                delay = self._retry_wait(e, attempt)
+                if delay is None:
+                    raise
+            self.sleep(delay)
+            attempt += 1
+
+    async def _apost(self, payload: dict) -> httpx.Response:
+        t0 = time.perf_counter()
+        r = await self.async_client.post(f"{self.base_url}/chat/completions", headers=self._headers(), json=payload)
+        r.raise_for_status()
+        self.latency.add((time.perf_counter() - t0) * 1000)
+        return r
+
+    async def _apost_hedged(self, payload: dict, info: dict) -> httpx.Response:
+        delay = self._hedge_delay()
+        if delay is None:
+            return await self._apost(payload)
+        prompt = payload["messages"][-1]["content"]
+        first = asyncio.ensure_future(self._apost(payload))
+        second = unused = extra = None
         try:
-            with httpx.Client(timeout=self.timeout) as client:
-                r = client.post(f"{self.base_url}/chat/completions", headers=headers, json=payload)
-                r.raise_for_status()
-                data = r.json()
-                text = data["choices"][0]["message"]["content"]
-                usage = data.get("usage", {})
-                in_tok = usage.get("prompt_tokens", est_in)
-                out_tok = usage.get("completion_tokens", max(1, len(text)//4))
-                cost = self._estimate_cost(in_tok, out_tok)
-                if not self.budget.check(cost):
-                    text = "[AI budget would be exceeded by this call]"
-                    cost = 0.0
-                else:
-                    self.budget.add(cost)
-                dt = int((time.time() - t0) * 1000)
-                self.audit({"provider":"openai_like","model":self.model,"cost_usd":cost,"latency_ms":dt,"usage":{"in":in_tok,"out":out_tok},"ts":time.time()})
-                return AIResponse(text=text, prompt_tokens=in_tok, completion_tokens=out_tok, cost_usd=cost, latency_ms=dt)
+            done, _ = await asyncio.wait({first}, timeout=delay)
+            if done:
+                return first.result()
+            extra = self.budget.reserve(self._worst_case_cost(prompt))
+            if extra is None:
+                return await first
+            info["hedged"] = True
+            second = unused = asyncio.ensure_future(self._apost(payload))  # charged to extra unless it wins
+            done, _ = await asyncio.wait({first, second}, return_when=asyncio.FIRST_COMPLETED)
+            winner = next(iter(done))
+            unused = second if winner is first else first
+            if winner.exception() is not None:
+                self._settle_extra(extra, prompt, winner)
+                extra = None
+                return await unused
+            return winner.result()
+        finally:
+            for task in (first, second):
+                if task is not None:
+                    task.cancel()
+            if extra is not None:
+                self._settle_extra(extra, prompt, unused)
+
+    async def _asend(self, payload: dict, info: dict) -> httpx.Response:
+        attempt = 0
+        while True:
+            info["attempts"] = attempt + 1
+            try:
+                return await self._apost_hedged(payload, info)
+            except Exception as e:
+                delay = self._retry_wait(e, attempt)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def chat(self, prompt: str, system: str | None = None) -> AIResponse:
+        t0 = time.time()
+        early, payload, reservation = self._prepare(prompt, system, t0)
+        if early:
+            return early
+        if not self.breaker.allow():
+            return self._rejected(t0, reservation)
+        info: dict = {}
+        try:
+            r = self._send(payload, info)
+            resp = self._complete(r.json(), prompt, t0, reservation, info)
         except Exception as e:
-            dt = int((time.time() - t0) * 1000)
-            self.audit({"provider":"openai_like","model":self.model,"error":str(e),"latency_ms":dt,"ts":time.time()})
-            return AIResponse(text=f"[AI error] {e}", prompt_tokens=0, completion_tokens=0, cost_usd=0.0, latency_ms=dt)
+            self.breaker.failure()
+            return self._failed(e, t0, reservation, info)
+        self.breaker.success()
+        return resp
+
+    async def achat(self, prompt: str, system: str | None = None) -> AIResponse:
+        t0 = time.time()
+        early, payload, reservation = self._prepare(prompt, system, t0)
+        if early:
+            return early
+        if not self.breaker.allow():
+            return self._rejected(t0, reservation)
+        info: dict = {}
+        try:
+            r = await self._asend(payload, info)
+            resp = self._complete(r.json(), prompt, t0, reservation, info)
+        except Exception as e:
+            self.breaker.failure()
+            return self._failed(e, t0, reservation, info)
+        except asyncio.CancelledError:  # e.g. a chat_many timeout; don't leave the reservation held
+            self.breaker.release()
+            self.budget.refund(reservation)
+            raise
+        self.breaker.success()
+        return resp
+
+_instance: OpenAILikeProvider | None = None
 
 def get() -> OpenAILikeProvider:
-    return OpenAILikeProvider()
+    # One provider per process so its connection pool is reused across calls.
+    global _instance
+    if _instance is None:
+        _instance = OpenAILikeProvider()
+    return _instance
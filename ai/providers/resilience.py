@@ -0,0 +1,106 @@
+
+from __future__ import annotations
+import random, threading, time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Deque, Optional
+
+import httpx
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+def retryable(e: Exception) -> bool:
+    """429/5xx responses and transport failures (connect errors, timeouts) are worth retrying."""
+    if isinstance(e, httpx.HTTPStatusError):
+        return e.response.status_code in RETRYABLE_STATUS
+    return isinstance(e, httpx.TransportError)
+
+def retry_after(e: Exception) -> Optional[float]:
+    """Seconds requested by a Retry-After header (delta-seconds or HTTP date), if any."""
+    if not isinstance(e, httpx.HTTPStatusError):
+        return None
+    value = e.response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt: int, base_sec: float, cap_sec: float) -> float:
+    """Full-jitter exponential backoff for the given 0-based retry attempt."""
+    return random.uniform(0, min(cap_sec, base_sec * 2 ** attempt))
+
+class CircuitBreaker:
+    """Fails fast after ``threshold`` consecutive failed calls.
+
+    Open for ``cooldown_sec``, then half-open: one trial call is let
+    through and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, threshold: int, cooldown_sec: float):
+        self.threshold = threshold
+        self.cooldown_sec = cooldown_sec
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self.opened_at >= self.cooldown_sec else "open"
+
+    def allow(self) -> bool:
+        if self.threshold <= 0:
+            return True
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+    def release(self) -> None:
+        """Give back a half-open trial whose call was abandoned before it had an outcome."""
+        with self._lock:
+            self._trial = False
+
+class LatencyTracker:
+    """Rolling window of successful request latencies, used to time hedged requests."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, ms: float) -> None:
+        with self._lock:
+            self._samples.append(ms)
+
+    def p95(self) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
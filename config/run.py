@@ -0,0 +1,11 @@
+"""The id of the current test run, shared by the controller and its xdist workers."""
+from __future__ import annotations
+import os
+
+RUN_ID_ENV = "PW_RUN_ID"
+
+
+def run_id() -> str:
+    # plugins.run_id sets it on the controller before xdist workers spawn;
+    # without it every process counts as its own run.
+    return os.getenv(RUN_ID_ENV) or f"local-{os.getpid()}"
@@ -7,7 +7,15 @@ configuration.
 """
 import os
 import pytest
-from playwright.sync_api import sync_playwright, Browser, Page
+import pytest_asyncio
+from playwright.async_api import async_playwright
+from playwright.async_api import Browser as AsyncBrowser, BrowserContext as AsyncBrowserContext, Page as AsyncPage
+from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page
+
+from flows.auth_cache import StorageStateCache, open_authenticated_context
+from plugins.browser_server import ws_endpoint_for
+from plugins.context_pool import ContextPool
+from plugins import failure_tracing, har_mode, network_profiles
 
 
 @pytest.fixture(scope="session")
@@ -18,22 +26,125 @@ def playwright_instance():
 
 
 @pytest.fixture(scope="session")
-def browser(playwright_instance: "sync_playwright") -> Browser:
+def browser(playwright_instance: "sync_playwright", pytestconfig: pytest.Config) -> Browser:
     """Launch a headless Chromium browser for the session.
 
+    Under xdist with ``--browser-servers`` the worker connects to one of the
+    controller's shared browser servers instead of launching its own.
     Modify this fixture to choose a different browser or make it dynamic
     based on command line options.
     """
-    browser = playwright_instance.chromium.launch(headless=True)
+    endpoint = ws_endpoint_for(pytestconfig)
+    if endpoint:
+        browser = playwright_instance.chromium.connect(endpoint)
+    else:
+        browser = playwright_instance.chromium.launch(headless=True)
     yield browser
     browser.close()
 
 
+@pytest.fixture(scope="session")
+def context_pool(browser: Browser, pytestconfig: pytest.Config) -> ContextPool:
+    """Session pool of warm browser contexts; a size of 0 keeps the old
+    context-per-test behaviour."""
+    pool = ContextPool(browser, size=pytestconfig.getoption("--context-pool-size"),
+                       on_create=failure_tracing.context_hook(pytestconfig))
+    pool.warm()
+    pytestconfig._context_pool = pool
+    yield pool
+    pool.close()
+
+
 @pytest.fixture(scope="function")
-def page(browser: Browser) -> Page:
-    """Create a new browser page for each test function."""
-    context = browser.new_context()
+def page(context_pool: ContextPool, request: pytest.FixtureRequest) -> Page:
+    """Create a new browser page for each test function.
+
+    The page lives in a pooled context unless the test is marked
+    ``isolated_context`` or HAR recording is on, in which case it gets a
+    fresh one.  The selected network profile's blocking routes (none while
+    recording a HAR) and any HAR record/replay routes are installed on that
+    context, and with tracing enabled the test records into its own trace
+    chunk.
+    """
+    har = har_mode.archive_for(request.node)
+    isolated = request.node.get_closest_marker("isolated_context") is not None
+    context = context_pool.acquire(isolated=isolated or bool(har and har.needs_fresh_context))
+    profile = network_profiles.profile_for(request.node) if not har or har.allows_blocking else "full"
+    blocker = network_profiles.NetworkBlocker(profile)
+    blocker.install(context)
+    if har:
+        # registered last so it sees app requests first; the rest fall through to the blocker
+        har.install(context, request.getfixturevalue("base_url"))
+    tracer = failure_tracing.ChunkTracer.for_item(request.node)
+    if tracer:
+        tracer.start(context)
     page = context.new_page()
     yield page
-    page.close()
-    context.close()
\ No newline at end of file
+    if tracer:
+        tracer.stop(context)
+    if blocker.active:
+        network_profiles.record(request.node, blocker)
+    context_pool.release(context)
+
+
+@pytest.fixture(scope="session")
+def auth_state_cache() -> StorageStateCache:
+    return StorageStateCache()
+
+
+@pytest.fixture(scope="function")
+def authenticated_context(browser: Browser, base_url: str, auth_state_cache: StorageStateCache):
+    """Factory for logged-in contexts: ``authenticated_context(user, password, role="user")``.
+
+    Reuses a cached storage_state when it is fresh and still passes the
+    login probe; otherwise logs in through the UI once and caches the result.
+    """
+    contexts = []
+
+    def _open(username: str, password: str, role: str = "user") -> BrowserContext:
+        context = open_authenticated_context(browser, base_url, username, password, role, cache=auth_state_cache)
+        contexts.append(context)
+        return context
+
+    yield _open
+    for context in contexts:
+        context.close()
+
+
+# ---- async stack -----------------------------------------------------------
+# Tests using these must share the session loop:
+#     @pytest.mark.asyncio(loop_scope="session")
+# One test can then drive several pages/users concurrently, e.g.
+#     await asyncio.gather(*(CheckoutFlow(p, base_url).buy_single_item(...) for p in pages))
+# Do not mix them with the sync fixtures in the same test: the sync API
+# refuses to start inside a running event loop.
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_playwright_instance():
+    """Start and yield an async Playwright instance for the entire session."""
+    async with async_playwright() as playwright:
+        yield playwright
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_browser(async_playwright_instance, pytestconfig: pytest.Config) -> AsyncBrowser:
+    """Async twin of ``browser``; honours ``--browser-servers`` the same way."""
+    endpoint = ws_endpoint_for(pytestconfig)
+    if endpoint:
+        browser = await async_playwright_instance.chromium.connect(endpoint)
+    else:
+        browser = await async_playwright_instance.chromium.launch(headless=True)
+    yield browser
+    await browser.close()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def async_context(async_browser: AsyncBrowser) -> AsyncBrowserContext:
+    context = await async_browser.new_context()
+    yield context
+    await context.close()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def async_page(async_context: AsyncBrowserContext) -> AsyncPage:
+    yield await async_context.new_page()
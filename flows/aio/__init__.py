@@ -0,0 +1 @@
+# Async variants of the business flows
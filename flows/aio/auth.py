@@ -0,0 +1,38 @@
+from __future__ import annotations
+from functools import cached_property
+from typing import Any, Dict, Tuple
+from playwright.async_api import Page
+from flows.auth import AUTH_PROBE_PATH, LOGIN_API_PATH, LOGIN_PATH
+from pages.aio.login_page import LoginPage
+
+class AuthFlow:
+    def __init__(self, page: Page, base_url: str) -> None:
+        self.page = page
+        self.base_url = base_url
+
+    @cached_property
+    def login_page(self) -> LoginPage:
+        return LoginPage(self.page)
+
+    async def login_via_ui(self, username: str, password: str) -> None:
+        await self.login_page.open(self.base_url)
+        await self.login_page.login(username, password)
+
+    async def login_via_api(self, username: str, password: str) -> None:
+        await self.page.context.request.post(f"{self.base_url}{LOGIN_API_PATH}",
+                                             data={"username": username, "password": password},
+                                             fail_on_status_code=True)
+
+    async def wait_logged_in(self, timeout_ms: int = 10000) -> None:
+        await self.page.wait_for_url(lambda url: LOGIN_PATH not in url, timeout=timeout_ms)
+
+    async def is_logged_in(self) -> bool:
+        await self.login_page.goto(f"{self.base_url}{AUTH_PROBE_PATH}")
+        return LOGIN_PATH not in self.page.url
+
+    async def expect_login_failed(self, message: str) -> None:
+        await self.login_page.expect_error(message)
+
+    async def login_and_return_context(self, username: str, password: str) -> Tuple[str, Dict[str, Any]]:
+        await self.login_via_ui(username, password)
+        return (username, await self.page.context.storage_state(path=None))
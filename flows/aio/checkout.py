@@ -0,0 +1,70 @@
+from __future__ import annotations
+from functools import cached_property
+from typing import Optional, Sequence, Tuple
+from playwright.async_api import Page
+from flows.aio.auth import AuthFlow
+from flows.checkout import CART_API_PATH, SEEDED_DEFAULT, cart_payload
+from pages import timing
+from pages.aio.products_page import ProductsPage
+from pages.aio.cart_page import CartPage
+from pages.aio.checkout_page import CheckoutPage, ShippingInfo
+
+class CheckoutFlow:
+    def __init__(self, page: Page, base_url: str) -> None:
+        self.page = page
+        self.base_url = base_url
+
+    # Page objects are built on first use; most tests only touch some of them.
+    @cached_property
+    def products(self) -> ProductsPage:
+        return ProductsPage(self.page)
+
+    @cached_property
+    def cart(self) -> CartPage:
+        return CartPage(self.page)
+
+    @cached_property
+    def checkout(self) -> CheckoutPage:
+        return CheckoutPage(self.page)
+
+    async def seed_cart(self, product_names: Sequence[str], credentials: Optional[Tuple[str, str]] = None) -> None:
+        if credentials:
+            await AuthFlow(self.page, self.base_url).login_via_api(*credentials)
+        await self.page.context.request.post(f"{self.base_url}{CART_API_PATH}",
+                                             data=cart_payload(product_names), fail_on_status_code=True)
+
+    async def buy_single_item(self, product_name: str, shipping: ShippingInfo, seeded: bool = SEEDED_DEFAULT,
+                              credentials: Optional[Tuple[str, str]] = None) -> None:
+        mode = "seeded" if seeded else "ui"
+        with timing.step("CheckoutFlow", "prepare_cart", mode):
+            if seeded:
+                await self.seed_cart([product_name], credentials)
+                await self.checkout.open(self.base_url)
+            else:
+                await self.products.open(self.base_url)
+                await self.products.add_to_cart(product_name)
+                await self.products.open_cart()
+                await self.cart.expect_item(product_name)
+                await self.cart.checkout()
+        await self._complete_checkout(shipping, mode)
+
+    async def buy_items(self, product_names: Sequence[str], shipping: ShippingInfo, seeded: bool = SEEDED_DEFAULT,
+                        credentials: Optional[Tuple[str, str]] = None) -> None:
+        mode = "seeded" if seeded else "ui"
+        with timing.step("CheckoutFlow", "prepare_cart", f"{mode}:{len(product_names)}"):
+            if seeded:
+                await self.seed_cart(product_names, credentials)
+                await self.checkout.open(self.base_url)
+            else:
+                await self.products.open(self.base_url)
+                await self.products.add_many_to_cart(product_names)
+                await self.products.open_cart()
+                await self.cart.expect_items(product_names)
+                await self.cart.checkout()
+        await self._complete_checkout(shipping, f"{mode}:{len(product_names)}")
+
+    async def _complete_checkout(self, shipping: ShippingInfo, mode: str) -> None:
+        with timing.step("CheckoutFlow", "checkout", mode):
+            await self.checkout.fill_shipping(shipping)
+            await self.checkout.place_order()
+            await self.checkout.expect_order_confirmed()
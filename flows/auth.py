@@ -1,18 +1,41 @@
 from __future__ import annotations
+import os
+from functools import cached_property
 from typing import Tuple
 from playwright.sync_api import Page
 from pages.login_page import LoginPage
 
+LOGIN_PATH = "/login"
+AUTH_PROBE_PATH = os.getenv("AUTH_PROBE_PATH", "/products")
+LOGIN_API_PATH = os.getenv("LOGIN_API_PATH", "/api/login")
+
 class AuthFlow:
     def __init__(self, page: Page, base_url: str) -> None:
         self.page = page
         self.base_url = base_url
-        self.login_page = LoginPage(page)
+
+    @cached_property
+    def login_page(self) -> LoginPage:
+        return LoginPage(self.page)
 
     def login_via_ui(self, username: str, password: str) -> None:
         self.login_page.open(self.base_url)
         self.login_page.login(username, password)
 
+    def login_via_api(self, username: str, password: str) -> None:
+        """Log in without the UI; the session cookie lands in the page's context."""
+        self.page.context.request.post(f"{self.base_url}{LOGIN_API_PATH}",
+                                       data={"username": username, "password": password},
+                                       fail_on_status_code=True)
+
+    def wait_logged_in(self, timeout_ms: int = 10000) -> None:
+        self.page.wait_for_url(lambda url: LOGIN_PATH not in url, timeout=timeout_ms)
+
+    def is_logged_in(self) -> bool:
+        """Cheap validity probe: a protected page must not bounce to the login screen."""
+        self.login_page.goto(f"{self.base_url}{AUTH_PROBE_PATH}")
+        return LOGIN_PATH not in self.page.url
+
     def expect_login_failed(self, message: str) -> None:
         self.login_page.expect_error(message)
 
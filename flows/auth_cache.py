@@ -0,0 +1,139 @@
+from __future__ import annotations
+import contextlib
+import hashlib
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from playwright.sync_api import Browser, BrowserContext
+
+from flows.auth import AuthFlow
+
+# Snapshots hold live session cookies: keep them out of artifacts/, which CI uploads.
+AUTH_STATE_DIR = Path(os.getenv("AUTH_STATE_DIR", ".auth_state"))
+AUTH_STATE_TTL_SEC = int(os.getenv("AUTH_STATE_TTL_SEC", "1800"))
+LOCK_STALE_SEC = 120
+LOCK_POLL_SEC = 0.2
+
+
+class StorageStateCache:
+    """storage_state snapshots on disk, keyed by (base_url, username, role).
+
+    Writes go through a temp file + ``os.replace`` so readers never see a
+    partial file, and a per-key lock file lets exactly one xdist worker log
+    in while the others wait and then reuse its result. The directory is
+    0700 and snapshots 0600, since they carry session cookies.
+    """
+
+    def __init__(self, root: Path = AUTH_STATE_DIR, ttl_sec: int = AUTH_STATE_TTL_SEC,
+                 sleep: Optional[Callable[[float], None]] = None) -> None:
+        self.root = Path(root)
+        self.ttl_sec = ttl_sec
+        self.sleep = sleep or time.sleep
+        self.root.mkdir(mode=0o700, parents=True, exist_ok=True)
+        os.chmod(self.root, 0o700)
+
+    @staticmethod
+    def key(base_url: str, username: str, role: str) -> str:
+        raw = json.dumps([base_url.rstrip("/"), username, role])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            entry = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("created", 0) > self.ttl_sec:
+            return None
+        state = entry.get("state") or {}
+        now = time.time()
+        # A session cookie that has already expired makes the snapshot useless.
+        if any(0 < c.get("expires", -1) < now for c in state.get("cookies", [])):
+            return None
+        return state
+
+    def store(self, key: str, state: Dict[str, Any]) -> None:
+        tmp = self.root / f".{key}.{uuid.uuid4().hex}.tmp"
+        fd = os.open(tmp, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"created": time.time(), "state": state}, f)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                tmp.unlink()
+            raise
+
+    def invalidate(self, key: str) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            self._path(key).unlink()
+
+    @contextlib.contextmanager
+    def lock(self, key: str, timeout_sec: float = 60.0) -> Iterator[None]:
+        lock_path = self.root / f"{key}.lock"
+        deadline = time.time() + timeout_sec
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                with contextlib.suppress(OSError):
+                    if time.time() - lock_path.stat().st_mtime > LOCK_STALE_SEC:
+                        lock_path.unlink()  # holder died mid-login
+                        continue
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise TimeoutError(f"Timed out waiting for auth cache lock {lock_path}")
+                self.sleep(min(LOCK_POLL_SEC, remaining))
+        try:
+            os.close(fd)
+            yield
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                lock_path.unlink()
+
+
+def open_authenticated_context(browser: Browser, base_url: str, username: str, password: str,
+                               role: str = "user", cache: Optional[StorageStateCache] = None) -> BrowserContext:
+    """Return a logged-in context, reusing a cached storage_state when it still works."""
+    cache = cache or StorageStateCache()
+    key = cache.key(base_url, username, role)
+
+    def from_cache() -> Optional[BrowserContext]:
+        state = cache.load(key)
+        if state is None:
+            return None
+        context = browser.new_context(storage_state=state)
+        page = context.new_page()
+        valid = AuthFlow(page, base_url).is_logged_in()
+        page.close()
+        if valid:
+            return context
+        context.close()
+        return None
+
+    context = from_cache()
+    if context:
+        return context
+    with cache.lock(key):
+        context = from_cache()  # another worker may have logged in meanwhile
+        if context:
+            return context
+        context = browser.new_context()
+        try:
+            page = context.new_page()
+            flow = AuthFlow(page, base_url)
+            flow.login_via_ui(username, password)
+            flow.wait_logged_in()
+            cache.store(key, context.storage_state())
+            page.close()
+        except Exception:
+            context.close()
+            raise
+        return context
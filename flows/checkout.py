@@ -1,23 +1,93 @@
 from __future__ import annotations
+import os
+from collections import Counter
+from functools import cached_property
+from typing import Optional, Sequence, Tuple
 from playwright.sync_api import Page
-from pages.products_page import ProductsPage
+from flows.auth import AuthFlow
+from pages import timing
+from pages.products_page import ProductsPage, product_slug
 from pages.cart_page import CartPage
 from pages.checkout_page import CheckoutPage, ShippingInfo
 
+CART_API_PATH = os.getenv("CART_API_PATH", "/api/cart")
+# CHECKOUT_SEEDED=1 makes seeded (API-prepared cart) the default for buy_single_item.
+SEEDED_DEFAULT = os.getenv("CHECKOUT_SEEDED", "0") == "1"
+
+def cart_payload(product_names: Sequence[str]) -> dict:
+    quantities = Counter(product_slug(name) for name in product_names)
+    return {"items": [{"sku": sku, "quantity": n} for sku, n in quantities.items()]}
+
 class CheckoutFlow:
     def __init__(self, page: Page, base_url: str) -> None:
         self.page = page
         self.base_url = base_url
-        self.products = ProductsPage(page)
-        self.cart = CartPage(page)
-        self.checkout = CheckoutPage(page)
-
-    def buy_single_item(self, product_name: str, shipping: ShippingInfo) -> None:
-        self.products.open(self.base_url)
-        self.products.add_to_cart(product_name)
-        self.products.open_cart()
-        self.cart.expect_item(product_name)
-        self.cart.checkout()
-        self.checkout.fill_shipping(shipping)
-        self.checkout.place_order()
-        self.checkout.expect_order_confirmed()
+
+    # Page objects are built on first use; most tests only touch some of them.
+    @cached_property
+    def products(self) -> ProductsPage:
+        return ProductsPage(self.page)
+
+    @cached_property
+    def cart(self) -> CartPage:
+        return CartPage(self.page)
+
+    @cached_property
+    def checkout(self) -> CheckoutPage:
+        return CheckoutPage(self.page)
+
+    def seed_cart(self, product_names: Sequence[str], credentials: Optional[Tuple[str, str]] = None) -> None:
+        """Put products in the cart through the API (context.request shares the browser's cookies).
+
+        ``credentials`` logs in through the API first when the context has no session yet.
+        """
+        if credentials:
+            AuthFlow(self.page, self.base_url).login_via_api(*credentials)
+        self.page.context.request.post(f"{self.base_url}{CART_API_PATH}",
+                                       data=cart_payload(product_names), fail_on_status_code=True)
+
+    def buy_single_item(self, product_name: str, shipping: ShippingInfo, seeded: bool = SEEDED_DEFAULT,
+                        credentials: Optional[Tuple[str, str]] = None) -> None:
+        """Buy one product; ``seeded`` skips the products and cart UI.
+
+        Both modes record the same "prepare_cart" and "checkout" steps in the
+        action timings (target "ui" / "seeded"), so runs are comparable.
+        """
+        mode = "seeded" if seeded else "ui"
+        with timing.step("CheckoutFlow", "prepare_cart", mode):
+            if seeded:
+                self.seed_cart([product_name], credentials)
+                self.checkout.open(self.base_url)
+            else:
+                self.products.open(self.base_url)
+                self.products.add_to_cart(product_name)
+                self.products.open_cart()
+                self.cart.expect_item(product_name)
+                self.cart.checkout()
+        self._complete_checkout(shipping, mode)
+
+    def buy_items(self, product_names: Sequence[str], shipping: ShippingInfo, seeded: bool = SEEDED_DEFAULT,
+                  credentials: Optional[Tuple[str, str]] = None) -> None:
+        """Buy a basket in bulk: one in-page add for all products, one cart check.
+
+        Repeat a name to buy it more than once.  ``seeded`` posts the whole
+        basket to the cart API instead.
+        """
+        mode = "seeded" if seeded else "ui"
+        with timing.step("CheckoutFlow", "prepare_cart", f"{mode}:{len(product_names)}"):
+            if seeded:
+                self.seed_cart(product_names, credentials)
+                self.checkout.open(self.base_url)
+            else:
+                self.products.open(self.base_url)
+                self.products.add_many_to_cart(product_names)
+                self.products.open_cart()
+                self.cart.expect_items(product_names)
+                self.cart.checkout()
+        self._complete_checkout(shipping, f"{mode}:{len(product_names)}")
+
+    def _complete_checkout(self, shipping: ShippingInfo, mode: str) -> None:
+        with timing.step("CheckoutFlow", "checkout", mode):
+            self.checkout.fill_shipping(shipping)
+            self.checkout.place_order()
+            self.checkout.expect_order_confirmed()
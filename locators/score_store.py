@@ -0,0 +1,174 @@
+from __future__ import annotations
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from config.run import run_id
+
+SCORES_PATH = Path(os.getenv("LOCATOR_SCORES_PATH", "artifacts/locator_scores.json"))
+# Wins and attempts lose half their weight every HALF_LIFE so stale winners age out.
+HALF_LIFE_SEC = float(os.getenv("LOCATOR_STATS_HALF_LIFE_H", "72")) * 3600
+EWMA_ALPHA = 0.3
+DEFAULT_PROBE_MS = 1.0
+
+Stats = Dict[str, Dict[str, Dict[str, float]]]  # key -> strategy -> {w, n, ms, ts}
+
+
+def _decay(value: float, age_sec: float) -> float:
+    return value * 0.5 ** (max(0.0, age_sec) / HALF_LIFE_SEC)
+
+
+def _apply(stats: Stats, event: Dict[str, Any]) -> None:
+    entry = stats.setdefault(event["k"], {}).setdefault(event["s"], {"w": 0.0, "n": 0.0, "ms": event["ms"], "ts": event["ts"]})
+    age = event["ts"] - entry["ts"]
+    entry["w"] = _decay(entry["w"], age) + (1.0 if event["hit"] else 0.0)
+    entry["n"] = _decay(entry["n"], age) + 1.0
+    entry["ms"] = (1 - EWMA_ALPHA) * entry["ms"] + EWMA_ALPHA * event["ms"]
+    entry["ts"] = max(entry["ts"], event["ts"])
+
+
+class ScoreStore:
+    """Process-wide locator scores with write-behind persistence.
+
+    The JSON snapshot is read once; lookups then update in-memory state
+    and queue deltas that are appended in batches to a per-process log
+    (``<stem>.<run id>.<pid>.log``).  Appends never touch the snapshot, so
+    xdist workers cannot clobber each other; ``compact()`` folds this
+    run's logs into the snapshot with an atomic replace and is run once at
+    session end.  Logs of another run sharing the directory are left alone.
+
+    Besides the plain per-target win counts, the store keeps per
+    (page pattern, target) strategy statistics -- decayed wins/attempts and
+    an EWMA of probe time -- that ``rank()`` turns into a probing order.
+    """
+
+    def __init__(self, path: Path, flush_every: int = 50, flush_interval_sec: float = 5.0) -> None:
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self.flush_interval_sec = flush_interval_sec
+        self._scores: Optional[Dict[str, int]] = None
+        self._stats: Optional[Stats] = None
+        self._pending: List[str] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    @property
+    def log_path(self) -> Path:
+        return self.path.with_name(f"{self.path.stem}.{run_id()}.{os.getpid()}.log")
+
+    def _read_snapshot(self) -> Tuple[Dict[str, int], Stats]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            return {}, {}
+        if not isinstance(data, dict):
+            return {}, {}
+        if "scores" not in data and "stats" not in data:
+            return data, {}  # legacy flat {target: count}
+        return data.get("scores", {}), data.get("stats", {})
+
+    def _load(self) -> None:
+        if self._scores is None:
+            self._scores, self._stats = self._read_snapshot()
+
+    @property
+    def scores(self) -> Dict[str, int]:
+        self._load()
+        return self._scores
+
+    @property
+    def stats(self) -> Stats:
+        self._load()
+        return self._stats
+
+    def get(self, target: str) -> int:
+        return self.scores.get(target, 0)
+
+    def _queue(self, line: Dict[str, Any]) -> bool:
+        self._pending.append(json.dumps(line))
+        return (len(self._pending) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval_sec)
+
+    def bump(self, target: str, n: int = 1) -> None:
+        with self._lock:
+            self.scores[target] = self.scores.get(target, 0) + n
+            due = self._queue({"t": target, "n": n})
+        if due:
+            self.flush()
+
+    def record(self, key: str, strategy: str, hit: bool, ms: float) -> None:
+        """Record one strategy attempt for a (page pattern, target) key."""
+        event = {"k": key, "s": strategy, "hit": hit, "ms": round(ms, 3), "ts": time.time()}
+        with self._lock:
+            _apply(self.stats, event)
+            due = self._queue(event)
+        if due:
+            self.flush()
+
+    def rank(self, key: str, strategies: Sequence[str]) -> List[str]:
+        """Order strategies by expected probe cost per success.
+
+        Unknown keys keep the caller's order.  Otherwise each strategy's
+        success rate uses a Beta(0.5, 0.5) prior over its decayed
+        wins/attempts, and cost is its average probe time divided by that
+        rate; ties keep the caller's order.
+        """
+        seen = self.stats.get(key)
+        if not seen:
+            return list(strategies)
+        now = time.time()
+
+        def expected_cost(item: Tuple[int, str]) -> Tuple[float, int]:
+            index, strategy = item
+            entry = seen.get(strategy)
+            if entry is None:
+                return DEFAULT_PROBE_MS / 0.5, index
+            age = now - entry["ts"]
+            rate = (_decay(entry["w"], age) + 0.5) / (_decay(entry["n"], age) + 1.0)
+            return max(entry["ms"], 0.01) / rate, index
+
+        return [s for _, s in sorted(enumerate(strategies), key=expected_cost)]
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._pending:
+                return
+            lines, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def compact(self) -> Dict[str, Any]:
+        """Merge this run's process logs into the snapshot. Call with no writers running."""
+        self.flush()
+        scores, stats = self._read_snapshot()
+        events = []
+        logs = sorted(self.path.parent.glob(f"{glob.escape(self.path.stem)}.{glob.escape(run_id())}.*.log"))
+        for log in logs:
+            for line in log.read_text(encoding="utf-8").splitlines():
+                try:
+                    delta = json.loads(line)
+                except ValueError:
+                    continue  # torn final line from a killed worker
+                if "t" in delta:
+                    scores[delta["t"]] = scores.get(delta["t"], 0) + delta["n"]
+                else:
+                    events.append(delta)
+        for event in sorted(events, key=lambda e: e["ts"]):  # decay depends on order
+            _apply(stats, event)
+        merged = {"scores": scores, "stats": stats}
+        if logs:
+            tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(merged, indent=2), encoding="utf-8")
+            os.replace(tmp, self.path)
+            for log in logs:
+                log.unlink()
+        self._scores, self._stats = scores, stats
+        return merged
@@ -1,61 +1,255 @@
 
 from __future__ import annotations
-import json, os
-from pathlib import Path
+import os, re, time, weakref
+from urllib.parse import urlsplit
 
+from ai.budget import feature
+from ai.cache import ResponseCache, cache_key, cacheable, provider_name
 from ai.providers import get_provider
+from ai.registry import PROMPT_VERSION
+from locators.score_store import SCORES_PATH, ScoreStore
 
-SCORES_PATH = Path(os.getenv("LOCATOR_SCORES_PATH", "artifacts/locator_scores.json"))
 SCORES_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 DEFAULT_STRATEGIES = ["get_by_role", "get_by_test_id", "get_by_text", "css", "xpath"]
 
-def _load_scores():
-    if SCORES_PATH.exists():
-        try:
-            return json.loads(SCORES_PATH.read_text(encoding="utf-8"))
-        except Exception:
-            return {}
-    return {}
+EXPLAIN_SYSTEM = "You are a senior test engineer. Be concise."
+EXPLAIN_PROMPT = "Suggest resilient Playwright locator strategies for: {target}. Return 3 ranked ideas."
+EXPLAIN_CACHE = ResponseCache(
+    "explain",
+    ttl_sec=float(os.getenv("AI_EXPLAIN_CACHE_TTL_SEC", str(7 * 24 * 3600))),
+    max_entries=int(os.getenv("AI_EXPLAIN_CACHE_MAX", "500")),
+)
+
+# Evaluates the candidate strategies in one round trip and returns
+# {epoch, hit, results: {strategy: [match count, ms]}}; a count is null where
+# the in-page approximation can't decide (e.g. Playwright-only CSS extensions)
+# so Python falls back to count().  The role/text probes only approximate
+# Playwright's engines, so a zero from them is reported as null; test-id,
+# css and xpath zeros are exact unless the page has shadow roots, which
+# querySelectorAll does not pierce.  With stopAtFirst it returns at the
+# first match.  `epoch` identifies the document and its structural mutation count;
+# when `cached` carries the current epoch only the cached strategy is checked.
+_PROBE_JS = """
+({ target, strategies, testIdAttr, stopAtFirst, cached }) => {
+  if (window.__smartLocatorDoc === undefined) {
+    window.__smartLocatorDoc = Math.random().toString(36).slice(2);
+    window.__smartLocatorMutations = 0;
+    new MutationObserver(() => { window.__smartLocatorMutations++; })
+      .observe(document, { subtree: true, childList: true, characterData: true });
+  }
+  const epoch = `${window.__smartLocatorDoc}:${window.__smartLocatorMutations}`;
+  const norm = s => (s || "").replace(/\\s+/g, " ").trim();
+  const all = () => document.querySelectorAll("*");
+  let shadow;
+  const hasShadow = () => shadow === undefined ? (shadow = [...all()].some(el => el.shadowRoot)) : shadow;
+  const heuristic = new Set(["get_by_role", "get_by_text"]);
+  const ariaHidden = el => {
+    for (let e = el; e; e = e.parentElement) {
+      if (e.getAttribute("aria-hidden") === "true") return true;
+      const cs = getComputedStyle(e);
+      if (cs.display === "none" || (e === el && cs.visibility === "hidden")) return true;
+    }
+    return false;
+  };
+  const accName = el => {
+    const label = el.getAttribute("aria-label");
+    if (label) return norm(label);
+    const by = el.getAttribute("aria-labelledby");
+    if (by) return norm(by.split(/\\s+/).map(id => (document.getElementById(id) || {}).textContent).join(" "));
+    if (el.tagName === "INPUT") return norm(el.value || el.getAttribute("alt") || el.title);
+    return norm(el.textContent || el.title);
+  };
+  const ownText = el => el.tagName === "INPUT" && /^(button|submit|reset)$/i.test(el.type) ? norm(el.value) : norm(el.textContent);
+  const probes = {
+    get_by_role: () => {
+      const needle = norm(target).toLowerCase();
+      return [...document.querySelectorAll(
+        "button, [role=button], input[type=button], input[type=submit], input[type=reset], input[type=image]"
+      )].filter(el => !ariaHidden(el) && accName(el).toLowerCase().includes(needle)).length;
+    },
+    get_by_test_id: () => document.querySelectorAll(`[${testIdAttr}="${CSS.escape(target)}"]`).length,
+    get_by_text: () => {
+      const want = norm(target);
+      return [...all()].filter(el => !/^(SCRIPT|STYLE|HEAD|TITLE|NOSCRIPT)$/.test(el.tagName)
+        && ownText(el) === want && ![...el.children].some(c => ownText(c) === want)).length;
+    },
+    css: () => document.querySelectorAll(target).length,
+    xpath: () => document.evaluate(target, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength,
+  };
+  const run = s => {
+    const t0 = performance.now();
+    let count = null;
+    try { count = probes[s] ? probes[s]() : null; } catch (e) { count = null; }
+    if (count === 0 && (heuristic.has(s) || hasShadow())) count = null;
+    return [count, performance.now() - t0];
+  };
+  if (cached && cached.epoch === epoch) {
+    const r = run(cached.strategy);
+    if (r[0] > 0) return { epoch, hit: true, results: { [cached.strategy]: r } };
+  }
+  const results = {};
+  for (const s of strategies) {
+    results[s] = run(s);
+    if (stopAtFirst && results[s][0] > 0) break;
+  }
+  return { epoch, hit: false, results };
+}
+"""
+
+SCORES = ScoreStore(SCORES_PATH)
+CACHE_STATS = {"hits": 0, "misses": 0}
+
+
+class _PageCache:
+    """target -> resolved strategy for one page; cleared on main-frame navigation."""
+
+    def __init__(self, page) -> None:
+        self.entries: dict = {}
+        self.hits = 0
+        self.misses = 0
+        main = page.main_frame
+        page.on("framenavigated", lambda frame: self.entries.clear() if frame == main else None)
 
-def _save_scores(scores):
-    SCORES_PATH.write_text(json.dumps(scores, indent=2), encoding="utf-8")
+    def count(self, hit: bool) -> None:
+        key = "hits" if hit else "misses"
+        setattr(self, key, getattr(self, key) + 1)
+        CACHE_STATS[key] += 1
+
+
+_PAGE_CACHES: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+def _cache_for(page) -> _PageCache:
+    cache = _PAGE_CACHES.get(page)
+    if cache is None:
+        cache = _PAGE_CACHES[page] = _PageCache(page)
+    return cache
+
+def page_pattern(url: str) -> str:
+    """Collapse a URL to host + path with ids masked, e.g. shop.test/orders/<n>."""
+    parts = urlsplit(url or "")
+    path = re.sub(r"/[0-9a-f]{8,}(?=/|$)", "/<id>", parts.path.lower())
+    path = re.sub(r"/\d+(?=/|$)", "/<n>", path)
+    return f"{parts.netloc}{path}" if parts.netloc else (url or "about:blank")
 
 class SmartLocator:
-    def __init__(self, page, ai_enabled: bool | None = None):
+    def __init__(self, page, ai_enabled: bool | None = None, probe_in_page: bool = True,
+                 test_id_attribute: str = "data-testid"):
         self.page = page
         self.ai_enabled = (os.getenv("AI_ENABLED", "1") == "1") if ai_enabled is None else ai_enabled
+        self.probe_in_page = probe_in_page
+        self.test_id_attribute = test_id_attribute
+
+    def _build(self, strat: str, target: str):
+        if strat == "get_by_role":
+            return self.page.get_by_role("button", name=target)
+        if strat == "get_by_test_id":
+            return self.page.get_by_test_id(target)
+        if strat == "get_by_text":
+            return self.page.get_by_text(target, exact=True)
+        if strat == "css":
+            return self.page.locator(target)
+        if strat == "xpath":
+            return self.page.locator(f"xpath={target}")
+        return None
+
+    def _evaluate(self, target: str, strategies, stop_at_first: bool, cached=None):
+        try:
+            out = self.page.evaluate(_PROBE_JS, {
+                "target": target, "strategies": strategies, "testIdAttr": self.test_id_attribute,
+                "stopAtFirst": stop_at_first, "cached": cached,
+            })
+        except Exception:
+            out = {"epoch": None, "hit": False, "results": {s: [None, 0.0] for s in strategies}}
+        results = {s: {"count": c, "unique": c == 1, "ms": ms} for s, (c, ms) in out["results"].items()}
+        return results, out["epoch"], out["hit"]
+
+    def probe(self, target: str, strategies=None, stop_at_first: bool = False) -> dict:
+        """Match counts for the strategies from a single in-page evaluation.
+
+        Returns ``{strategy: {"count": int | None, "unique": bool, "ms": float}}``;
+        a ``None`` count means the strategy must be checked with ``count()``.
+        With ``stop_at_first`` strategies after the first match are omitted.
+        """
+        return self._evaluate(target, list(strategies or DEFAULT_STRATEGIES), stop_at_first)[0]
+
+    def _first_match(self, target: str, strategies, key: str, probed: dict):
+        for strat in strategies:
+            result = probed.get(strat, {})
+            count, ms = result.get("count"), result.get("ms", 0.0)
+            loc, hit = None, False
+            if count != 0:
+                t0 = time.perf_counter()
+                try:
+                    loc = self._build(strat, target)
+                    hit = loc is not None and bool(count or loc.count() > 0)
+                except Exception:
+                    hit = False
+                if count is None:
+                    ms += (time.perf_counter() - t0) * 1000
+            SCORES.record(key, strat, hit, ms)
+            if hit:
+                return strat, loc
+        return None, None
+
+    def _cached_hit(self, target: str, entry: dict):
+        """Existence check for a cached resolution when probing in Python."""
+        try:
+            loc = self._build(entry["strategy"], target)
+            return loc if loc is not None and loc.count() > 0 else None
+        except Exception:
+            return None
 
     def find(self, target: str, strategies=None):
         strategies = strategies or DEFAULT_STRATEGIES
-        scores = _load_scores()
-        best = None
-        for strat in strategies:
-            try:
-                loc = None
-                if strat == "get_by_role":
-                    loc = self.page.get_by_role("button", name=target)
-                elif strat == "get_by_test_id":
-                    loc = self.page.get_by_test_id(target)
-                elif strat == "get_by_text":
-                    loc = self.page.get_by_text(target, exact=True)
-                elif strat == "css":
-                    loc = self.page.locator(target)
-                elif strat == "xpath":
-                    loc = self.page.locator(f"xpath={target}")
-                if loc is not None and loc.count() > 0:
-                    best = loc
-                    # Update score (simple +1)
-                    scores[target] = scores.get(target, 0) + 1
-                    break
-            except Exception:
-                continue
-        _save_scores(scores)
+        cache = _cache_for(self.page)
+        entry_key = (target, tuple(strategies))
+        entry = cache.entries.get(entry_key)
+        key = f"{page_pattern(self.page.url)}|{target}"
+        ordered = SCORES.rank(key, strategies)
+
+        epoch, probed = None, {}
+        if self.probe_in_page:
+            probed, epoch, hit = self._evaluate(target, ordered, True, entry)
+            if hit:
+                strat = entry["strategy"]
+                SCORES.record(key, strat, True, probed[strat]["ms"])
+                best = self._build(strat, target)
+            else:
+                strat, best = self._first_match(target, ordered, key, probed)
+        else:
+            best = self._cached_hit(target, entry) if entry else None
+            hit = best is not None
+            if hit:
+                strat = entry["strategy"]
+            else:
+                strat, best = self._first_match(target, ordered, key, probed)
+        cache.count(hit)
+        if best is not None:
+            cache.entries[entry_key] = {"strategy": strat, "epoch": epoch}
+        else:
+            cache.entries.pop(entry_key, None)
         return best
 
+    def cache_stats(self) -> dict:
+        """Hit/miss counters of this page's resolution cache."""
+        cache = _cache_for(self.page)
+        return {"hits": cache.hits, "misses": cache.misses, "entries": len(cache.entries)}
+
     def explain(self, target: str) -> str:
         if not self.ai_enabled:
             return "[AI disabled]"
         prov = get_provider()
-        prompt = f"Suggest resilient Playwright locator strategies for: {target}. Return 3 ranked ideas."
-        return prov.chat(prompt, system="You are a senior test engineer. Be concise.").text
+        key = cache_key(target, provider_name(prov), prov.model, EXPLAIN_SYSTEM, EXPLAIN_PROMPT, PROMPT_VERSION)
+        cached = EXPLAIN_CACHE.get(key)
+        if cached is not None:
+            prov.audit({"event": "explain_cache", "hit": True, "model": prov.model,
+                        "saved_cost_usd": cached["cost_usd"], "ts": time.time()})
+            return cached["text"]
+        with feature("locator_explain"):
+            resp = prov.chat(EXPLAIN_PROMPT.format(target=target), system=EXPLAIN_SYSTEM)
+        prov.audit({"event": "explain_cache", "hit": False, "model": prov.model,
+                    "cost_usd": resp.cost_usd, "ts": time.time()})
+        if cacheable(resp.text):
+            EXPLAIN_CACHE.put(key, {"text": resp.text, "cost_usd": resp.cost_usd})
+        return resp.text
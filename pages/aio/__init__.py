@@ -0,0 +1 @@
+# Async (playwright.async_api) variants of the page objects
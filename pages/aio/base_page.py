@@ -0,0 +1,80 @@
+from __future__ import annotations
+from typing import Dict, Mapping, Optional
+from playwright.async_api import Page, Locator, expect
+from pages.base_page import FILL_FORM_JS, FormFillError
+from pages.timing import timed
+
+class BasePage:
+    # Subclasses declare ``__slots__ = ()`` and their locators with pages.lazy.
+    __slots__ = ("page", "default_timeout_ms", "_lazy")
+    test_id_attribute = "data-testid"
+
+    def __init__(self, page: Page, default_timeout_ms: int = 10000) -> None:
+        self.page = page
+        self.default_timeout_ms = default_timeout_ms
+        self._lazy: Dict[str, Locator] = {}
+
+    @timed("goto")
+    async def goto(self, url: str) -> None:
+        await self.page.goto(url, wait_until="domcontentloaded")
+
+    @timed("wait_for_url_contains")
+    async def wait_for_url_contains(self, fragment: str, timeout_ms: Optional[int] = None) -> None:
+        timeout = timeout_ms or self.default_timeout_ms
+        await self.page.wait_for_url(f"**{fragment}**", timeout=timeout)
+
+    def el(self, selector: str) -> Locator:
+        return self.page.locator(selector)
+
+    def by_test_id(self, test_id: str) -> Locator:
+        return self.page.get_by_test_id(test_id)
+
+    def by_role(self, role: str, name: Optional[str] = None) -> Locator:
+        return self.page.get_by_role(role=role, name=name) if name else self.page.get_by_role(role=role)
+
+    @timed("wait_visible")
+    async def wait_visible(self, locator: Locator, timeout_ms: Optional[int] = None) -> None:
+        timeout = timeout_ms or self.default_timeout_ms
+        await locator.wait_for(state="visible", timeout=timeout)
+
+    @timed("wait_hidden")
+    async def wait_hidden(self, locator: Locator, timeout_ms: Optional[int] = None) -> None:
+        timeout = timeout_ms or self.default_timeout_ms
+        await locator.wait_for(state="hidden", timeout=timeout)
+
+    @timed("click")
+    async def click(self, locator: Locator) -> None:
+        await self.wait_visible(locator); await locator.click()
+
+    @timed("fill")
+    async def fill(self, locator: Locator, value: str, clear: bool = True) -> None:
+        await self.wait_visible(locator)
+        if clear: await locator.fill("")
+        await locator.fill(value)
+
+    @timed("expect_text")
+    async def expect_text(self, locator: Locator, expected: str, timeout_ms: Optional[int] = None) -> None:
+        timeout = timeout_ms or self.default_timeout_ms
+        await expect(locator).to_have_text(expected, timeout=timeout)
+
+    @timed("expect_contains_text")
+    async def expect_contains_text(self, locator: Locator, fragment: str, timeout_ms: Optional[int] = None) -> None:
+        timeout = timeout_ms or self.default_timeout_ms
+        await expect(locator).to_contain_text(fragment, timeout=timeout)
+
+    @timed("fill_form")
+    async def fill_form(self, fields: Mapping[str, str], fallback: bool = True, timeout_ms: Optional[int] = None) -> None:
+        """Async twin of ``pages.base_page.BasePage.fill_form``."""
+        if not fields:
+            return
+        await self.wait_visible(self.by_test_id(next(iter(fields))), timeout_ms)
+        errors = await self.page.evaluate(FILL_FORM_JS, {"fields": list(fields.items()), "attr": self.test_id_attribute})
+        if errors and fallback:
+            for test_id in list(errors):
+                try:
+                    await self.fill(self.by_test_id(test_id), fields[test_id])
+                    del errors[test_id]
+                except Exception as e:
+                    errors[test_id] = str(e).splitlines()[0]
+        if errors:
+            raise FormFillError(errors)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+from collections import Counter
+from typing import List, Optional, Sequence, Tuple
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from pages import lazy
+from pages.cart_page import CART_DIFF_JS, CART_ITEMS_SELECTOR, CART_MATCHES_JS, CART_SNAPSHOT_JS, diff_report
+from .base_page import BasePage
+
+class CartPage(BasePage):
+    __slots__ = ()
+
+    page_title = lazy.role("heading", name="Your Cart")
+    checkout_btn = lazy.role("button", name="Checkout")
+    cart_items = lazy.css(CART_ITEMS_SELECTOR)
+
+    async def expect_item(self, name: str) -> None:
+        await self.expect_contains_text(self.cart_items, name)
+
+    async def cart_snapshot(self) -> List[Tuple[str, int]]:
+        return [(name, qty) for name, qty, _ in await self.page.evaluate(CART_SNAPSHOT_JS, CART_ITEMS_SELECTOR)]
+
+    async def expect_items(self, names: Sequence[str], timeout_ms: Optional[int] = None) -> None:
+        expected = dict(Counter(names))
+        arg = {"selector": CART_ITEMS_SELECTOR, "expected": expected}
+        try:
+            await self.page.wait_for_function(CART_MATCHES_JS, arg=arg, timeout=timeout_ms or self.default_timeout_ms)
+        except PlaywrightTimeoutError:
+            raise AssertionError(diff_report(await self.page.evaluate(CART_DIFF_JS, arg), expected)) from None
+
+    async def checkout(self) -> None:
+        await self.click(self.checkout_btn)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+from pages.checkout_page import ShippingInfo
+from pages import lazy
+from .base_page import BasePage
+
+__all__ = ["CheckoutPage", "ShippingInfo"]
+
+class CheckoutPage(BasePage):
+    __slots__ = ()
+
+    first_name = lazy.test_id("ship-first-name")
+    last_name = lazy.test_id("ship-last-name")
+    address1 = lazy.test_id("ship-address1")
+    city = lazy.test_id("ship-city")
+    zip_code = lazy.test_id("ship-zip")
+    country = lazy.test_id("ship-country")
+    place_order_btn = lazy.role("button", name="Place Order")
+    confirmation = lazy.test_id("order-confirmation")
+
+    async def open(self, base_url: str) -> None:
+        await self.goto(f"{base_url}/checkout")
+        await self.wait_visible(self.first_name)
+
+    async def fill_shipping(self, info: ShippingInfo) -> None:
+        await self.fill_form({
+            "ship-first-name": info.first_name,
+            "ship-last-name": info.last_name,
+            "ship-address1": info.address1,
+            "ship-city": info.city,
+            "ship-zip": info.zip_code,
+            "ship-country": info.country,
+        })
+
+    async def place_order(self) -> None:
+        await self.click(self.place_order_btn)
+
+    async def expect_order_confirmed(self) -> None:
+        await self.expect_contains_text(self.confirmation, "Thank you")
@@ -0,0 +1,22 @@
+from __future__ import annotations
+from pages import lazy
+from .base_page import BasePage
+
+class LoginPage(BasePage):
+    __slots__ = ()
+
+    username_input = lazy.test_id("login-username")
+    password_input = lazy.test_id("login-password")
+    submit_btn = lazy.role("button", name="Sign In")
+    error_banner = lazy.test_id("login-error")
+
+    async def open(self, base_url: str) -> None:
+        await self.goto(f"{base_url}/login")
+        await self.wait_visible(self.username_input)
+
+    async def login(self, username: str, password: str) -> None:
+        await self.fill_form({"login-username": username, "login-password": password})
+        await self.click(self.submit_btn)
+
+    async def expect_error(self, message: str) -> None:
+        await self.expect_contains_text(self.error_banner, message)
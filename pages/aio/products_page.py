@@ -0,0 +1,40 @@
+from __future__ import annotations
+from typing import List, Sequence
+from playwright.async_api import Locator
+from pages import lazy
+from pages.products_page import ADD_MANY_JS, product_slug
+from .base_page import BasePage
+
+class ProductsPage(BasePage):
+    __slots__ = ()
+
+    page_title = lazy.role("heading", name="Products")
+    cart_icon = lazy.test_id("cart-link")
+
+    async def open(self, base_url: str) -> None:
+        await self.goto(f"{base_url}/products")
+        await self.wait_visible(self.page_title)
+
+    def product_tile(self, name: str) -> Locator:
+        return self.by_test_id(f"product-{product_slug(name)}")
+
+    def add_button_for(self, name: str) -> Locator:
+        return self.product_tile(name).get_by_role("button", name="Add to Cart")
+
+    async def add_to_cart(self, name: str) -> None:
+        await self.click(self.add_button_for(name))
+
+    async def add_many_to_cart(self, names: Sequence[str], fallback: bool = True) -> List[str]:
+        if not names:
+            return []
+        await self.wait_visible(self.product_tile(names[0]))
+        missed = await self.page.evaluate(ADD_MANY_JS, {
+            "items": [[name, product_slug(name)] for name in names], "attr": self.test_id_attribute,
+        })
+        if fallback:
+            for name in missed:
+                await self.add_to_cart(name)
+        return missed
+
+    async def open_cart(self) -> None:
+        await self.click(self.cart_icon)
@@ -1,15 +1,58 @@
 from __future__ import annotations
-from typing import Optional
+from typing import Dict, Mapping, Optional
 from playwright.sync_api import Page, Locator, expect
+from pages.timing import timed
+
+# Fills [test-id] fields in one evaluation the way Locator.fill does (value
+# setter + input/change events) and returns {test_id: reason} for the ones it
+# could not fill, so callers can retry those through the auto-waiting path.
+FILL_FORM_JS = """
+({ fields, attr }) => {
+  const errors = {};
+  const unfillable = /^(checkbox|radio|file|button|submit|reset|image|range|color|hidden)$/i;
+  for (const [id, value] of fields) {
+    const matches = document.querySelectorAll(`[${attr}="${CSS.escape(id)}"]`);
+    if (matches.length !== 1) { errors[id] = matches.length ? `${matches.length} elements match` : "not found"; continue; }
+    const el = matches[0];
+    const isInput = el instanceof HTMLInputElement, isArea = el instanceof HTMLTextAreaElement;
+    if (!(isInput || isArea || el.isContentEditable) || (isInput && unfillable.test(el.type))) { errors[id] = "not fillable"; continue; }
+    if (el.disabled || el.readOnly) { errors[id] = "disabled or read-only"; continue; }
+    const rect = el.getBoundingClientRect();
+    if ((!rect.width && !rect.height) || getComputedStyle(el).visibility === "hidden") { errors[id] = "not visible"; continue; }
+    el.focus();
+    if (el.isContentEditable) {
+      el.textContent = value;
+    } else {
+      const proto = isArea ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+      Object.getOwnPropertyDescriptor(proto, "value").set.call(el, value);
+    }
+    el.dispatchEvent(new Event("input", { bubbles: true }));
+    el.dispatchEvent(new Event("change", { bubbles: true }));
+  }
+  return errors;
+}
+"""
+
+class FormFillError(Exception):
+    def __init__(self, errors: Dict[str, str]) -> None:
+        self.errors = errors
+        super().__init__("Could not fill: " + ", ".join(f"{k} ({v})" for k, v in errors.items()))
 
 class BasePage:
+    # Subclasses declare ``__slots__ = ()`` and their locators with pages.lazy.
+    __slots__ = ("page", "default_timeout_ms", "_lazy")
+    test_id_attribute = "data-testid"
+
     def __init__(self, page: Page, default_timeout_ms: int = 10000) -> None:
         self.page = page
         self.default_timeout_ms = default_timeout_ms
+        self._lazy: Dict[str, Locator] = {}
 
+    @timed("goto")
     def goto(self, url: str) -> None:
         self.page.goto(url, wait_until="domcontentloaded")
 
+    @timed("wait_for_url_contains")
     def wait_for_url_contains(self, fragment: str, timeout_ms: Optional[int] = None) -> None:
         timeout = timeout_ms or self.default_timeout_ms
         self.page.wait_for_url(f"**{fragment}**", timeout=timeout)
@@ -23,26 +66,55 @@ class BasePage:
     def by_role(self, role: str, name: Optional[str] = None) -> Locator:
         return self.page.get_by_role(role=role, name=name) if name else self.page.get_by_role(role=role)
 
+    @timed("wait_visible")
     def wait_visible(self, locator: Locator, timeout_ms: Optional[int] = None) -> None:
         timeout = timeout_ms or self.default_timeout_ms
         locator.wait_for(state="visible", timeout=timeout)
 
+    @timed("wait_hidden")
     def wait_hidden(self, locator: Locator, timeout_ms: Optional[int] = None) -> None:
         timeout = timeout_ms or self.default_timeout_ms
         locator.wait_for(state="hidden", timeout=timeout)
 
+    @timed("click")
     def click(self, locator: Locator) -> None:
         self.wait_visible(locator); locator.click()
 
+    @timed("fill")
     def fill(self, locator: Locator, value: str, clear: bool = True) -> None:
         self.wait_visible(locator)
         if clear: locator.fill("")
         locator.fill(value)
 
+    @timed("expect_text")
     def expect_text(self, locator: Locator, expected: str, timeout_ms: Optional[int] = None) -> None:
         timeout = timeout_ms or self.default_timeout_ms
         expect(locator).to_have_text(expected, timeout=timeout)
 
+    @timed("expect_contains_text")
     def expect_contains_text(self, locator: Locator, fragment: str, timeout_ms: Optional[int] = None) -> None:
         timeout = timeout_ms or self.default_timeout_ms
         expect(locator).to_contain_text(fragment, timeout=timeout)
+
+    @timed("fill_form")
+    def fill_form(self, fields: Mapping[str, str], fallback: bool = True, timeout_ms: Optional[int] = None) -> None:
+        """Fill several fields, keyed by test id, in one browser round trip.
+
+        Waits for the first field to be visible, then fills them all in-page.
+        Fields that could not be filled are retried one by one via ``fill``
+        when ``fallback`` is set; whatever still fails raises ``FormFillError``
+        with a per-field reason.
+        """
+        if not fields:
+            return
+        self.wait_visible(self.by_test_id(next(iter(fields))), timeout_ms)
+        errors = self.page.evaluate(FILL_FORM_JS, {"fields": list(fields.items()), "attr": self.test_id_attribute})
+        if errors and fallback:
+            for test_id in list(errors):
+                try:
+                    self.fill(self.by_test_id(test_id), fields[test_id])
+                    del errors[test_id]
+                except Exception as e:
+                    errors[test_id] = str(e).splitlines()[0]
+        if errors:
+            raise FormFillError(errors)
@@ -1,15 +1,91 @@
 from __future__ import annotations
-from playwright.sync_api import Page, Locator
+from collections import Counter
+from typing import List, Mapping, Optional, Sequence, Tuple
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from pages import lazy
 from .base_page import BasePage
 
+CART_ITEMS_SELECTOR = "[data-testid='cart-items']"
+
+# [name, quantity, exact] for each cart line (children of the cart-items
+# container), in order.  The name is the line's cart-item-name element when it
+# has one (exact), else the whole line text; the quantity comes from a
+# cart-item-quantity element (input value or text) and defaults to 1.
+CART_SNAPSHOT_JS = """
+(selector) => {
+  const norm = s => (s || "").replace(/\\s+/g, " ").trim();
+  const box = document.querySelector(selector);
+  return box ? [...box.children].map(el => {
+    const name = el.querySelector("[data-testid='cart-item-name']");
+    const qty = el.querySelector("[data-testid='cart-item-quantity']");
+    const n = qty ? parseInt(("value" in qty && qty.value) || norm(qty.textContent).replace(/^\\D+/, ""), 10) : 1;
+    return [norm(name ? name.textContent : el.textContent), n > 0 ? n : 1, !!name];
+  }) : [];
+}
+"""
+
+# Compares the cart lines with the expected {name: quantity}.  A line belongs
+# to the longest expected name it equals (or, without a name element, starts
+# with as a whole word), so "Shirt" is not satisfied by "T-Shirt"; quantities
+# are summed over lines.  The cart is ready when both lists are empty.
+CART_DIFF_JS = """
+({ selector, expected }) => {
+  const lines = (""" + CART_SNAPSHOT_JS.strip() + """)(selector);
+  const names = Object.keys(expected).sort((a, b) => b.length - a.length);
+  const owns = (text, exact, n) => text === n || (!exact && text.startsWith(n) && !/[\\w-]/.test(text[n.length]));
+  const got = {};
+  const unexpected = [];
+  for (const [text, qty, exact] of lines) {
+    const name = names.find(n => owns(text, exact, n));
+    if (name === undefined) unexpected.push([text, qty]);
+    else got[name] = (got[name] || 0) + qty;
+  }
+  const missing = [];
+  for (const [name, want] of Object.entries(expected)) {
+    const have = got[name] || 0;
+    if (have < want) missing.push([name, want, have]);
+    else if (have > want) unexpected.push([name, have - want]);
+  }
+  return { missing, unexpected, lines: lines.length };
+}
+"""
+
+CART_MATCHES_JS = f"arg => {{ const d = ({CART_DIFF_JS.strip()})(arg); return !d.missing.length && !d.unexpected.length; }}"
+
+def _shown(items: Sequence[str]) -> str:
+    return ", ".join(items[:20]) + (f" (+{len(items) - 20} more)" if len(items) > 20 else "")
+
+def diff_report(diff: dict, expected: Mapping[str, int]) -> str:
+    parts = []
+    if diff["missing"]:
+        parts.append("missing " + _shown([f"{name} (want {want}, got {have})" for name, want, have in diff["missing"]]))
+    if diff["unexpected"]:
+        parts.append("unexpected " + _shown([f"{name} x{qty}" for name, qty in diff["unexpected"]]))
+    return (f"Cart does not match the {sum(expected.values())} expected items: {'; '.join(parts)}; "
+            f"cart has {diff['lines']} lines")
+
 class CartPage(BasePage):
-    def __init__(self, page: Page) -> None:
-        super().__init__(page)
-        self.page_title: Locator = self.by_role("heading", name="Your Cart")
-        self.checkout_btn: Locator = self.by_role("button", name="Checkout")
+    __slots__ = ()
+
+    page_title = lazy.role("heading", name="Your Cart")
+    checkout_btn = lazy.role("button", name="Checkout")
+    cart_items = lazy.css(CART_ITEMS_SELECTOR)
 
     def expect_item(self, name: str) -> None:
-        self.expect_contains_text(self.page.locator("[data-testid='cart-items']"), name)
+        self.expect_contains_text(self.cart_items, name)
+
+    def cart_snapshot(self) -> List[Tuple[str, int]]:
+        """(name, quantity) of every cart line, in order."""
+        return [(name, qty) for name, qty, _ in self.page.evaluate(CART_SNAPSHOT_JS, CART_ITEMS_SELECTOR)]
+
+    def expect_items(self, names: Sequence[str], timeout_ms: Optional[int] = None) -> None:
+        """Wait until the cart holds exactly ``names`` (repeat a name for quantity 2), compared in-page per poll."""
+        expected = dict(Counter(names))
+        arg = {"selector": CART_ITEMS_SELECTOR, "expected": expected}
+        try:
+            self.page.wait_for_function(CART_MATCHES_JS, arg=arg, timeout=timeout_ms or self.default_timeout_ms)
+        except PlaywrightTimeoutError:
+            raise AssertionError(diff_report(self.page.evaluate(CART_DIFF_JS, arg), expected)) from None
 
     def checkout(self) -> None:
         self.click(self.checkout_btn)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from playwright.sync_api import Page, Locator
+from pages import lazy
 from .base_page import BasePage
 
 @dataclass(frozen=True)
@@ -13,24 +13,30 @@ class ShippingInfo:
     country: str
 
 class CheckoutPage(BasePage):
-    def __init__(self, page: Page) -> None:
-        super().__init__(page)
-        self.first_name: Locator = self.by_test_id("ship-first-name")
-        self.last_name: Locator  = self.by_test_id("ship-last-name")
-        self.address1: Locator   = self.by_test_id("ship-address1")
-        self.city: Locator       = self.by_test_id("ship-city")
-        self.zip_code: Locator   = self.by_test_id("ship-zip")
-        self.country: Locator    = self.by_test_id("ship-country")
-        self.place_order_btn: Locator = self.by_role("button", name="Place Order")
-        self.confirmation: Locator = self.by_test_id("order-confirmation")
+    __slots__ = ()
+
+    first_name = lazy.test_id("ship-first-name")
+    last_name = lazy.test_id("ship-last-name")
+    address1 = lazy.test_id("ship-address1")
+    city = lazy.test_id("ship-city")
+    zip_code = lazy.test_id("ship-zip")
+    country = lazy.test_id("ship-country")
+    place_order_btn = lazy.role("button", name="Place Order")
+    confirmation = lazy.test_id("order-confirmation")
+
+    def open(self, base_url: str) -> None:
+        self.goto(f"{base_url}/checkout")
+        self.wait_visible(self.first_name)
 
     def fill_shipping(self, info: ShippingInfo) -> None:
-        self.fill(self.first_name, info.first_name)
-        self.fill(self.last_name, info.last_name)
-        self.fill(self.address1, info.address1)
-        self.fill(self.city, info.city)
-        self.fill(self.zip_code, info.zip_code)
-        self.fill(self.country, info.country)
+        self.fill_form({
+            "ship-first-name": info.first_name,
+            "ship-last-name": info.last_name,
+            "ship-address1": info.address1,
+            "ship-city": info.city,
+            "ship-zip": info.zip_code,
+            "ship-country": info.country,
+        })
 
     def place_order(self) -> None:
         self.click(self.place_order_btn)
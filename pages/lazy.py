@@ -0,0 +1,48 @@
+"""Declarative, lazily built locators for page objects.
+
+Declared on the class instead of built in ``__init__``::
+
+    class CartPage(BasePage):
+        __slots__ = ()
+        checkout_btn = lazy.role("button", name="Checkout")
+
+The Locator is created on first access through the page object's own
+``by_*`` helpers and cached in its ``_lazy`` slot, so constructing a page
+object costs nothing for locators a test never touches.  Works for the
+sync and the async page objects alike.
+"""
+from __future__ import annotations
+from typing import Any, Callable, Optional
+
+
+class LazyLocator:
+    __slots__ = ("build", "name")
+
+    def __init__(self, build: Callable[[Any], Any]) -> None:
+        self.build = build
+        self.name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: Any, owner: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        cache = obj._lazy
+        try:
+            return cache[self.name]
+        except KeyError:
+            locator = cache[self.name] = self.build(obj)
+            return locator
+
+
+def test_id(value: str) -> LazyLocator:
+    return LazyLocator(lambda page: page.by_test_id(value))
+
+
+def role(value: str, name: Optional[str] = None) -> LazyLocator:
+    return LazyLocator(lambda page: page.by_role(value, name))
+
+
+def css(selector: str) -> LazyLocator:
+    return LazyLocator(lambda page: page.el(selector))
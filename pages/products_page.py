@@ -1,19 +1,56 @@
 from __future__ import annotations
-from playwright.sync_api import Page, Locator
+from typing import List, Sequence
+from playwright.sync_api import Locator
+from pages import lazy
 from .base_page import BasePage
 
+def product_slug(name: str) -> str:
+    return name.lower().replace(' ', '-')
+
+# Clicks each tile's "Add to Cart" button in one evaluation and returns the
+# names it did not click: a missing, disabled, hidden or covered button, and
+# every repeat of a name, which the caller adds through Playwright's
+# auto-waiting click once the first add has settled.
+ADD_MANY_JS = """
+({ items, attr }) => {
+  const missed = [];
+  const clicked = new Set();
+  const norm = s => (s || "").replace(/\\s+/g, " ").trim().toLowerCase();
+  const clickable = b => {
+    if (b.disabled || b.getAttribute("aria-disabled") === "true") return false;
+    const cs = getComputedStyle(b);
+    if (cs.visibility !== "visible" || cs.pointerEvents === "none") return false;
+    b.scrollIntoView({ block: "center", inline: "center" });
+    const r = b.getBoundingClientRect();
+    if (!r.width || !r.height) return false;
+    const top = document.elementFromPoint(r.left + r.width / 2, r.top + r.height / 2);
+    return !!top && (top === b || b.contains(top));
+  };
+  for (const [name, slug] of items) {
+    if (clicked.has(slug)) { missed.push(name); continue; }
+    const tile = document.querySelector(`[${attr}="product-${CSS.escape(slug)}"]`);
+    const button = tile && [...tile.querySelectorAll("button, [role=button], input[type=button], input[type=submit]")]
+      .find(b => norm(b.getAttribute("aria-label") || b.textContent || b.value).includes("add to cart"));
+    if (!button || !clickable(button)) { missed.push(name); continue; }
+    button.click();
+    clicked.add(slug);
+  }
+  return missed;
+}
+"""
+
 class ProductsPage(BasePage):
-    def __init__(self, page: Page) -> None:
-        super().__init__(page)
-        self.page_title: Locator = self.by_role("heading", name="Products")
-        self.cart_icon: Locator  = self.by_test_id("cart-link")
+    __slots__ = ()
+
+    page_title = lazy.role("heading", name="Products")
+    cart_icon = lazy.test_id("cart-link")
 
     def open(self, base_url: str) -> None:
         self.goto(f"{base_url}/products")
         self.wait_visible(self.page_title)
 
     def product_tile(self, name: str) -> Locator:
-        return self.by_test_id(f"product-{name.lower().replace(' ', '-')}")
+        return self.by_test_id(f"product-{product_slug(name)}")
 
     def add_button_for(self, name: str) -> Locator:
         return self.product_tile(name).get_by_role("button", name="Add to Cart")
@@ -21,5 +58,24 @@ class ProductsPage(BasePage):
     def add_to_cart(self, name: str) -> None:
         self.click(self.add_button_for(name))
 
+    def add_many_to_cart(self, names: Sequence[str], fallback: bool = True) -> List[str]:
+        """Add several products with one browser round trip.
+
+        Products whose button could not be clicked in-page (missing,
+        disabled, hidden or covered) and repeated names are added one by one
+        through ``add_to_cart`` when ``fallback`` is set; the names that went
+        through that slow path are returned.
+        """
+        if not names:
+            return []
+        self.wait_visible(self.product_tile(names[0]))
+        missed = self.page.evaluate(ADD_MANY_JS, {
+            "items": [[name, product_slug(name)] for name in names], "attr": self.test_id_attribute,
+        })
+        if fallback:
+            for name in missed:
+                self.add_to_cart(name)
+        return missed
+
     def open_cart(self) -> None:
         self.click(self.cart_icon)
@@ -0,0 +1,107 @@
+"""Optional per-action latency recording for page objects.
+
+``@timed("click")`` wraps a BasePage method.  While no recorder is enabled
+the wrapper costs one global lookup; ``enable()`` (done by
+``plugins.action_timing``) makes every wrapped call report
+(page class, action, target, ms).  Nested actions are timed inclusively,
+e.g. ``click`` includes the ``wait_visible`` it performs.
+"""
+from __future__ import annotations
+import functools
+import inspect
+import re
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+# Upper bounds (ms) of the histogram buckets; the last one is open-ended.
+BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, float("inf"))
+
+Key = Tuple[str, str, str]  # (page class, action, target)
+
+
+def bucket_label(bound: float) -> str:
+    return f"<={bound:g}ms" if bound != float("inf") else f">{BUCKETS_MS[-2]:g}ms"
+
+
+def describe(target: Any) -> str:
+    """Short label for a Locator (its selector) or any other action argument."""
+    if isinstance(target, str):
+        return target
+    if isinstance(target, Mapping):
+        return ",".join(map(str, target))
+    m = re.search(r"selector=(['\"])(.*)\1>$", repr(target))
+    return m.group(2) if m else type(target).__name__
+
+
+class ActionRecorder:
+    """Collects action timings for the current test."""
+
+    def __init__(self) -> None:
+        self.samples: Dict[Key, List[float]] = defaultdict(list)
+
+    def record(self, owner: str, action: str, target: str, ms: float) -> None:
+        self.samples[(owner, action, target)].append(ms)
+
+    def take(self) -> Dict[Key, List[float]]:
+        samples, self.samples = self.samples, defaultdict(list)
+        return samples
+
+
+_recorder: Optional[ActionRecorder] = None
+
+
+def enable(recorder: Optional[ActionRecorder]) -> None:
+    global _recorder
+    _recorder = recorder
+
+
+def recorder() -> Optional[ActionRecorder]:
+    return _recorder
+
+
+@contextmanager
+def step(owner: str, action: str, target: str = "") -> Iterator[None]:
+    """Time an arbitrary block (e.g. a flow step) like a page action."""
+    rec = _recorder
+    if rec is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        rec.record(owner, action, target, (time.perf_counter() - t0) * 1000)
+
+
+def timed(action: str):
+    """Record the wrapped page-object method as ``action`` on its first argument."""
+    def deco(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(self, *args, **kwargs):
+                rec = _recorder
+                if rec is None:
+                    return await fn(self, *args, **kwargs)
+                t0 = time.perf_counter()
+                try:
+                    return await fn(self, *args, **kwargs)
+                finally:
+                    rec.record(type(self).__name__, action, describe(args[0]) if args else "",
+                               (time.perf_counter() - t0) * 1000)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            rec = _recorder
+            if rec is None:
+                return fn(self, *args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(self, *args, **kwargs)
+            finally:
+                rec.record(type(self).__name__, action, describe(args[0]) if args else "",
+                           (time.perf_counter() - t0) * 1000)
+        return wrapper
+    return deco
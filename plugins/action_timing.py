@@ -0,0 +1,103 @@
+"""Per-action latency report for page objects.
+
+With ``--action-timing`` (or ``PW_ACTION_TIMING=1``) every ``@timed``
+BasePage method (goto, click, fill, waits, expects) is measured.  Each
+test gets its timings and a latency histogram in ``user_properties`` plus
+an "action timing" report section; the session ends with the slowest
+page actions aggregated over all tests (xdist workers included, since
+the data travels with the reports).
+"""
+from __future__ import annotations
+import os
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+import pytest
+
+from pages import timing
+
+TOP_N = int(os.getenv("PW_ACTION_TIMING_TOP", "15"))
+
+_totals: Dict[Tuple[str, str, str], List[float]] = {}  # key -> [count, total ms, max ms]
+
+
+def histogram(durations: List[float]) -> Dict[str, int]:
+    counts = [0] * len(timing.BUCKETS_MS)
+    for ms in durations:
+        counts[bisect_left(timing.BUCKETS_MS, ms)] += 1
+    return {timing.bucket_label(b): n for b, n in zip(timing.BUCKETS_MS, counts) if n}
+
+
+def _format(rows: List[list], hist: Dict[str, int]) -> str:
+    lines = [f"{'total ms':>10} {'n':>4} {'max ms':>9}  action"]
+    for owner, action, target, n, total, worst in sorted(rows, key=lambda r: -r[4]):
+        lines.append(f"{total:>10.1f} {n:>4} {worst:>9.1f}  {owner}.{action} {target}".rstrip())
+    lines.append("histogram: " + ", ".join(f"{k}: {v}" for k, v in hist.items()))
+    return "\n".join(lines)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("action-timing")
+    group.addoption(
+        "--action-timing",
+        action="store_true",
+        default=os.getenv("PW_ACTION_TIMING", "0") == "1",
+        help="Time every page-object action and report the slowest ones",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    _totals.clear()
+    if config.getoption("--action-timing"):
+        timing.enable(timing.ActionRecorder())
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    timing.enable(None)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item: pytest.Item) -> None:
+    rec = timing.recorder()
+    if rec is not None:
+        rec.take()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item: pytest.Item, nextitem) -> None:
+    yield  # fixture teardown (e.g. page close) is part of the test's timings
+    rec = timing.recorder()
+    samples = rec.take() if rec is not None else None
+    if not samples:
+        return
+    rows = [[owner, action, target, len(ms), round(sum(ms), 1), round(max(ms), 1)]
+            for (owner, action, target), ms in samples.items()]
+    hist = histogram([d for ms in samples.values() for d in ms])
+    item.user_properties.append(("action_timings", rows))
+    item.user_properties.append(("action_histogram", hist))
+    item.add_report_section("teardown", "action timing", _format(rows, hist))
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    if report.when != "teardown":
+        return
+    for name, value in report.user_properties:
+        if name != "action_timings":
+            continue
+        for owner, action, target, n, total, worst in value:
+            entry = _totals.setdefault((owner, action, target), [0, 0.0, 0.0])
+            entry[0] += n
+            entry[1] += total
+            entry[2] = max(entry[2], worst)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config) -> None:
+    if not _totals:
+        return
+    terminalreporter.section("slowest page actions")
+    terminalreporter.write_line(f"{'total ms':>10} {'n':>6} {'avg ms':>8} {'max ms':>9}  action")
+    slowest = sorted(_totals.items(), key=lambda kv: -kv[1][1])[:TOP_N]
+    for (owner, action, target), (n, total, worst) in slowest:
+        terminalreporter.write_line(
+            f"{total:>10.1f} {n:>6} {total / n:>8.1f} {worst:>9.1f}  {owner}.{action} {target}".rstrip()
+        )
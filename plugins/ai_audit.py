@@ -0,0 +1,39 @@
+"""Flush and merge the per-worker AI audit logs, then summarize this run.
+
+Workers flush their buffered ``ai_audit.<run>.<worker>.log`` at session end;
+the controller then merges this run's files (run id from plugins.run_id)
+into ``artifacts/ai_audit.log`` and prints the run's call count, error
+rate, p50/p95 latency and cost by model.
+"""
+from __future__ import annotations
+import pytest
+
+from ai import audit
+from config.run import run_id
+
+
+def _is_controller(config: pytest.Config) -> bool:
+    return not hasattr(config, "workerinput")
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session: pytest.Session, exitstatus) -> None:
+    sink = audit.sink()
+    if _is_controller(session.config):
+        sink.merge()
+    else:
+        sink.flush()
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config) -> None:
+    if not _is_controller(config):
+        return
+    stats = audit.summarize(audit.sink().entries(run=run_id()))
+    if not (stats["calls"] or stats["cache_hits"] or stats["rejected"]):
+        return
+    cost = ", ".join(f"{model} ${usd:.4f}" for model, usd in sorted(stats["cost_by_model"].items()))
+    terminalreporter.write_line(
+        f"AI calls: {stats['calls']} ({stats['error_rate']:.1%} errors), "
+        f"p50 {stats['p50_latency_ms']:.0f} ms, p95 {stats['p95_latency_ms']:.0f} ms; cost {cost or '$0'}; "
+        f"{stats['cache_hits']} cache hits, {stats['rejected']} rejected by the circuit breaker"
+    )
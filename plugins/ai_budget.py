@@ -0,0 +1,53 @@
+"""Run-wide AI budget: one ledger for the controller and every xdist worker.
+
+Every process of a run (see plugins.run_id) reserves against the same
+``AI_BUDGET_USD`` in ``artifacts/ai_budget.sqlite``.  At session end it
+prints the spend, remaining budget and per-feature breakdown, and writes
+them to ``artifacts/ai_budget.json``.
+"""
+from __future__ import annotations
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from ai import budget
+from ai.providers.base import AI_BUDGET_USD
+
+REPORT_PATH = Path(os.getenv("AI_BUDGET_REPORT", "artifacts/ai_budget.json"))
+
+
+def _is_controller(config: pytest.Config) -> bool:
+    return not hasattr(config, "workerinput")
+
+
+def _existing_ledger(config: pytest.Config):
+    # Runs without AI calls never create the ledger file.
+    if not _is_controller(config) or not os.path.exists(budget.AI_BUDGET_LEDGER):
+        return None
+    return budget.ledger(AI_BUDGET_USD)
+
+
+def pytest_sessionstart(session: pytest.Session) -> None:
+    ledger = _existing_ledger(session.config)
+    if ledger is not None:
+        ledger.prune()
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config) -> None:
+    ledger = _existing_ledger(config)
+    if ledger is None:
+        return
+    report = ledger.report()
+    if not report["features"] and not report["held_usd"]:
+        return
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_PATH.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    terminalreporter.write_line(
+        f"AI budget: spent ${report['spent_usd']:.4f} of ${report['ceiling_usd']:.2f}, "
+        f"${report['remaining_usd']:.4f} remaining"
+        + (f" (${report['held_usd']:.4f} still reserved)" if report["held_usd"] else "")
+    )
+    for name, entry in sorted(report["features"].items(), key=lambda kv: -kv[1]["cost_usd"]):
+        terminalreporter.write_line(f"  {name:<16} {entry['calls']:>5} calls  ${entry['cost_usd']:.4f}")
@@ -0,0 +1,220 @@
+"""Share a few Chromium servers across pytest-xdist workers.
+
+By default every xdist worker launches its own browser.  With
+``--browser-servers=N`` the controller starts N Playwright browser servers
+before the workers spawn and hands their websocket endpoints to the workers,
+which ``connect()`` to ``endpoints[worker_index % N]`` instead of launching.
+Browser memory then scales with N rather than with ``-n``.
+
+``--prelaunch-browser`` reuses the same server machinery to hide browser
+start-up behind collection: the first collected item that needs a browser
+starts a local server in a background thread, and the ``browser`` fixture
+later just connects to it.  If no selected test needs a browser the server
+is torn down again, so pure data runs never keep one around.
+"""
+from __future__ import annotations
+import json
+import os
+import subprocess
+import tempfile
+import threading
+from typing import List, Optional
+
+import pytest
+# Same entry point `python -m playwright` uses; calling the driver directly
+# keeps the node process as our child so terminate() reaches it on all OSes.
+from playwright._impl._driver import compute_driver_executable, get_driver_env
+
+ENDPOINTS_KEY = "pw_ws_endpoints"
+BROWSER_FIXTURES = {"browser", "async_browser"}
+# A driver that hangs before printing its endpoint is killed after this long.
+START_TIMEOUT_SEC = float(os.getenv("PW_SERVER_START_TIMEOUT", "60"))
+
+
+def _first_line(proc: subprocess.Popen, timeout_sec: float) -> Optional[str]:
+    """First stdout line of ``proc``, or None if it takes longer than ``timeout_sec``."""
+    lines: List[str] = []
+    done = threading.Event()
+
+    def read() -> None:
+        lines.append(proc.stdout.readline())
+        done.set()
+
+    threading.Thread(target=read, name="pw-server-stdout", daemon=True).start()
+    return lines[0].strip() if done.wait(timeout_sec) else None
+
+
+class BrowserServer:
+    def __init__(self, browser_name: str = "chromium", headless: bool = True) -> None:
+        self.browser_name = browser_name
+        self.headless = headless
+        self.ws_endpoint: Optional[str] = None
+        self._proc: Optional[subprocess.Popen] = None
+        self._config_path: Optional[str] = None
+        self._log = None
+        self._stopped = False
+
+    def start(self, timeout_sec: float = START_TIMEOUT_SEC) -> str:
+        fd, self._config_path = tempfile.mkstemp(prefix="pw-server-", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"headless": self.headless}, f)
+        driver = compute_driver_executable()
+        cmd = list(driver) if isinstance(driver, (tuple, list)) else [driver]
+        cmd += ["launch-server", "--browser", self.browser_name, "--config", self._config_path]
+        # stderr goes to a file so a chatty server can never fill a pipe we stop reading
+        self._log = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+        self._proc = proc = subprocess.Popen(
+            cmd, env=get_driver_env(), stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE, stderr=self._log, text=True,
+        )
+        if self._stopped:  # stop() ran on another thread while we were spawning
+            self.stop()
+            raise RuntimeError(f"{self.browser_name} server stopped while starting")
+        line = _first_line(proc, timeout_sec)
+        if line is None:
+            self.stop()
+            raise RuntimeError(f"{self.browser_name} server printed no endpoint within {timeout_sec:g}s")
+        if not line.startswith("ws"):
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                pass
+            err = self._stderr()
+            self.stop()
+            raise RuntimeError(f"{self.browser_name} server failed to start: {line or err}")
+        self.ws_endpoint = line
+        return line
+
+    def _stderr(self) -> str:
+        try:
+            self._log.seek(0)
+            return self._log.read().strip()
+        except (AttributeError, ValueError):  # already stopped from another thread
+            return ""
+
+    def stop(self) -> None:
+        self._stopped = True
+        if self._proc and self._proc.poll() is None:
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+        self._proc = None
+        if self._log:
+            self._log.close()
+            self._log = None
+        if self._config_path and os.path.exists(self._config_path):
+            os.remove(self._config_path)
+
+
+class Prelaunch:
+    """Starts a BrowserServer on a daemon thread; endpoint() joins it."""
+
+    def __init__(self) -> None:
+        self.server = BrowserServer()
+        self.error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._run, name="pw-prelaunch", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            self.server.start()
+        except Exception as e:
+            self.error = e
+
+    def endpoint(self, timeout_sec: float = 60.0) -> Optional[str]:
+        self._thread.join(timeout_sec)
+        return None if self.error or self._thread.is_alive() else self.server.ws_endpoint
+
+    def stop(self, timeout_sec: float = 10.0) -> None:
+        # If it is still starting, killing the driver unblocks the thread.
+        self.server.stop()
+        self._thread.join(timeout_sec)
+
+
+def _needs_browser(item: pytest.Item) -> bool:
+    return not BROWSER_FIXTURES.isdisjoint(getattr(item, "fixturenames", ()))
+
+
+def _is_distributed(config: pytest.Config) -> bool:
+    return bool(getattr(config.option, "numprocesses", 0)) and getattr(config.option, "dist", "no") != "no"
+
+
+def ws_endpoint_for(config: pytest.Config) -> Optional[str]:
+    """Endpoint this process should connect to, or None to launch locally."""
+    workerinput = getattr(config, "workerinput", None)
+    endpoints: List[str] = (workerinput or {}).get(ENDPOINTS_KEY) or []
+    if not endpoints:
+        prelaunch = getattr(config, "_browser_prelaunch", None)
+        return prelaunch.endpoint() if prelaunch else None
+    index = int(workerinput["workerid"].lstrip("gw") or 0)
+    return endpoints[index % len(endpoints)]
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("browser-server")
+    group.addoption(
+        "--browser-servers",
+        type=int,
+        default=int(os.getenv("PW_BROWSER_SERVERS", "0")),
+        help="Under xdist, start N shared Chromium servers that workers connect to (0 disables)",
+    )
+    group.addoption(
+        "--prelaunch-browser",
+        action="store_true",
+        default=os.getenv("PW_PRELAUNCH", "0") == "1",
+        help="Start Chromium in the background while tests are still being collected",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    count = config.getoption("--browser-servers")
+    if count <= 0 or hasattr(config, "workerinput") or not _is_distributed(config):
+        return
+    servers = []
+    try:
+        for _ in range(count):
+            server = BrowserServer()
+            server.start()
+            servers.append(server)
+    except Exception as e:
+        for server in servers:
+            server.stop()
+        # Fall back to per-worker launches rather than failing browser-free runs.
+        config.issue_config_time_warning(pytest.PytestWarning(f"--browser-servers disabled: {e}"), stacklevel=2)
+        return
+    config._browser_servers = servers
+
+
+def pytest_itemcollected(item: pytest.Item) -> None:
+    config = item.config
+    if (getattr(config, "_browser_prelaunch", None) is not None
+            or not config.getoption("--prelaunch-browser")
+            or (getattr(config, "workerinput", None) or {}).get(ENDPOINTS_KEY)
+            or not _needs_browser(item)):
+        return
+    config._browser_prelaunch = Prelaunch()
+
+
+def pytest_collection_finish(session: pytest.Session) -> None:
+    prelaunch = getattr(session.config, "_browser_prelaunch", None)
+    if prelaunch and not any(_needs_browser(item) for item in session.items):
+        # only deselected tests wanted a browser
+        prelaunch.stop()
+        session.config._browser_prelaunch = None
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node) -> None:
+    servers = getattr(node.config, "_browser_servers", None)
+    if servers:
+        node.workerinput[ENDPOINTS_KEY] = [s.ws_endpoint for s in servers]
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    for server in getattr(config, "_browser_servers", []):
+        server.stop()
+    prelaunch = getattr(config, "_browser_prelaunch", None)
+    if prelaunch:
+        prelaunch.stop()
@@ -0,0 +1,114 @@
+"""Warm pool of BrowserContexts shared by the ``page`` fixture.
+
+Creating a context per test dominates wall time at suite volume, so the
+pool keeps ``--context-pool-size`` contexts alive for the session and
+resets them between tests.  Tests that touch state the reset cannot undo
+(init scripts, exposed bindings, default timeouts) should be marked
+``@pytest.mark.isolated_context`` to get a fresh context instead.
+"""
+from __future__ import annotations
+import os
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Set
+
+import pytest
+from playwright.sync_api import Browser, BrowserContext, Error
+
+
+class ContextPool:
+    def __init__(self, browser: Browser, size: int = 0,
+                 context_args: Optional[Dict[str, Any]] = None,
+                 on_create: Optional[Callable[[BrowserContext], None]] = None) -> None:
+        self.browser = browser
+        self.size = max(0, size)
+        self.context_args = dict(context_args or {})
+        self.on_create = on_create
+        self._idle: Deque[BrowserContext] = deque()
+        self._fresh: Set[int] = set()
+        self.stats = {"hits": 0, "misses": 0, "fresh": 0, "recycled": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def _new_context(self) -> BrowserContext:
+        context = self.browser.new_context(**self.context_args)
+        if self.on_create:
+            self.on_create(context)
+        return context
+
+    def warm(self) -> None:
+        while len(self._idle) < self.size:
+            self._idle.append(self._new_context())
+
+    def acquire(self, isolated: bool = False) -> BrowserContext:
+        if isolated or not self.enabled:
+            context = self._new_context()
+            self._fresh.add(id(context))
+            self.stats["fresh"] += 1
+            return context
+        if self._idle:
+            self.stats["hits"] += 1
+            return self._idle.popleft()
+        self.stats["misses"] += 1
+        return self._new_context()
+
+    def release(self, context: BrowserContext) -> None:
+        if id(context) in self._fresh:
+            self._fresh.discard(id(context))
+            self._close(context)
+            return
+        if len(self._idle) < self.size and self._reset(context):
+            self._idle.append(context)
+        else:
+            self.stats["recycled"] += 1
+            self._close(context)
+
+    def _reset(self, context: BrowserContext) -> bool:
+        """Return the context to a clean state; False means it must be discarded."""
+        try:
+            for p in list(context.pages):
+                p.close()  # also drops sessionStorage
+            context.unroute_all(behavior="ignoreErrors")
+            context.clear_cookies()
+            context.clear_permissions()
+            context.set_extra_http_headers({})
+            context.set_offline(False)
+            # localStorage outlives its pages and cannot be wiped without
+            # visiting each origin, so a context that wrote any is retired.
+            state = context.storage_state()
+            return not any(o.get("localStorage") for o in state.get("origins", []))
+        except Error:
+            return False
+
+    @staticmethod
+    def _close(context: BrowserContext) -> None:
+        try:
+            context.close()
+        except Error:
+            pass
+
+    def close(self) -> None:
+        while self._idle:
+            self._close(self._idle.popleft())
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("context-pool")
+    group.addoption(
+        "--context-pool-size",
+        type=int,
+        default=int(os.getenv("PW_CONTEXT_POOL_SIZE", "0")),
+        help="Keep N warm BrowserContexts for the page fixture (0 disables pooling)",
+    )
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config) -> None:
+    pool = getattr(config, "_context_pool", None)
+    if pool is None or not pool.enabled:
+        return
+    s = pool.stats
+    terminalreporter.write_line(
+        f"Context pool (size {pool.size}): {s['hits']} reused, {s['misses']} misses, "
+        f"{s['fresh']} isolated, {s['recycled']} recycled"
+    )
@@ -1,15 +1,121 @@
 import os
+import gzip
+import json
+import queue
 import random
+import re
 import time
+import hashlib
 import pathlib
+import threading
 import pytest
 
+from config.run import run_id
+
 SEED = int(os.getenv("SEED", "42"))
 random.seed(SEED)
 
 ARTIFACTS_DIR = pathlib.Path("artifacts")
 ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
 
+SCREENSHOT_QUALITY = int(os.getenv("ARTIFACT_JPEG_QUALITY", "80"))
+MAX_PENDING = int(os.getenv("ARTIFACT_MAX_PENDING", "32"))
+
+
+def _atomic_write(path: pathlib.Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class ArtifactWriter:
+    """Persists failure artifacts on a background thread.
+
+    DOM dumps are gzip-compressed and stored by content hash under
+    ``dom/`` so identical pages from many failing tests are written once;
+    ``index-<worker>.jsonl`` maps each test to its files.  When more than
+    ``max_pending`` jobs are queued the caller writes inline instead of
+    buffering without bound.  A job that fails to write (full disk,
+    unencodable DOM) is counted in ``dropped`` rather than raised, on
+    either path.
+    """
+
+    def __init__(self, root: pathlib.Path, max_pending: int = MAX_PENDING) -> None:
+        self.root = root
+        self.index = root / f"index-{os.getenv('PYTEST_XDIST_WORKER', 'main')}.jsonl"
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = None
+        self.dropped = 0
+        self.last_error = ""
+        self._lock = threading.Lock()  # the writer thread and inline writes both drop
+
+    def submit(self, nodeid: str, screenshot: bytes, html: str) -> None:
+        job = (nodeid, screenshot, html)
+        if self._thread is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            (self.root / "dom").mkdir(exist_ok=True)
+            self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+            self._thread.start()
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            self._write_or_drop(job)
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._write_or_drop(job)
+            finally:
+                self._queue.task_done()
+
+    def _write_or_drop(self, job: tuple) -> None:
+        try:
+            self._write(*job)
+        except Exception as e:
+            with self._lock:
+                self.dropped += 1
+                self.last_error = f"{job[0]}: {type(e).__name__}: {e}"
+
+    def _write(self, nodeid: str, screenshot: bytes, html: str) -> None:
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid).strip("_")
+        entry = {"nodeid": nodeid, "ts": time.time()}
+        if screenshot:
+            shot = self.root / f"{safe}.jpg"
+            _atomic_write(shot, screenshot)
+            entry["screenshot"] = shot.name
+        if html:
+            raw = html.encode("utf-8")
+            dom = self.root / "dom" / f"{hashlib.sha256(raw).hexdigest()[:20]}.html.gz"
+            if not dom.exists():
+                _atomic_write(dom, gzip.compress(raw, compresslevel=6))
+            entry["dom"] = f"dom/{dom.name}"
+        with open(self.index, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def drain(self) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+
+def run_dir() -> pathlib.Path:
+    """One directory per run, shared by the controller and its xdist workers."""
+    return ARTIFACTS_DIR / f"run_{run_id()}"
+
+
+writer = ArtifactWriter(run_dir())
+
+
+def pytest_configure(config):
+    global writer
+    writer = ArtifactWriter(run_dir())  # the run id is only known once plugins.run_id has run
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
@@ -19,15 +125,38 @@ def pytest_runtest_makereport(item, call):
     page = item.funcargs.get("page")
     if not page:
         return
-    safe = item.nodeid.replace("::", "_").replace("/", "_").replace("\\", "_")
-    ts = int(time.time())
-    png = ARTIFACTS_DIR / f"{safe}_{ts}.png"
-    html = ARTIFACTS_DIR / f"{safe}_{ts}.html"
+    # Capturing needs the live page; encoding, compression and disk I/O happen on the writer thread.
+    screenshot, html = b"", ""
     try:
-        page.screenshot(path=str(png), full_page=True)
+        screenshot = page.screenshot(type="jpeg", quality=SCREENSHOT_QUALITY, full_page=True)
     except Exception:
         pass
     try:
-        html.write_text(page.content(), encoding="utf-8")
+        html = page.content()
     except Exception:
         pass
+    writer.submit(item.nodeid, screenshot, html)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    writer.drain()
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:  # handed to the controller in pytest_testnodedown
+        workeroutput["artifacts_dropped"] = writer.dropped
+        workeroutput["artifacts_last_error"] = writer.last_error
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    output = getattr(node, "workeroutput", {})
+    if output.get("artifacts_dropped"):
+        writer.dropped += output["artifacts_dropped"]
+        writer.last_error = output["artifacts_last_error"]
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if writer.dropped:
+        terminalreporter.write_line(
+            f"Failure artifacts: {writer.dropped} not written to {writer.root} (last error: {writer.last_error})",
+            yellow=True,
+        )
@@ -0,0 +1,120 @@
+"""Keep Playwright tracing running and persist a trace only for failures.
+
+Tracing is started once per BrowserContext (pooled contexts included) and
+each test records into its own chunk.  A passing test's chunk is discarded
+with ``stop_chunk()`` -- no zip is built or written -- while a failed or
+retried test's chunk is saved to ``artifacts/traces/``.
+
+Enabled through pytest-playwright's ``--tracing`` option when it is present
+(``retain-on-failure``; ``on`` keeps every chunk) or ``PW_TRACING``.
+"""
+from __future__ import annotations
+import os
+import re
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import pytest
+from playwright.sync_api import BrowserContext
+
+TRACES_DIR = Path(os.getenv("PW_TRACES_DIR", "artifacts/traces"))
+_REPORTS = pytest.StashKey[Dict[str, pytest.TestReport]]()
+_stats: Dict[str, float] = {"tests": 0, "overhead_ms": 0.0, "kept": 0}
+
+
+def tracing_mode(config: pytest.Config) -> str:
+    # Use pytest-playwright's built-in --tracing if present; else fall back to env.
+    try:
+        mode = config.getoption("--tracing")
+    except ValueError:
+        mode = None
+    return mode or os.getenv("PW_TRACING", "off")
+
+
+def context_hook(config: pytest.Config) -> Optional[Callable[[BrowserContext], None]]:
+    """Per-context tracing start, for ContextPool(on_create=...)."""
+    if tracing_mode(config) == "off":
+        return None
+    return lambda context: context.tracing.start(screenshots=True, snapshots=True, sources=True)
+
+
+class ChunkTracer:
+    def __init__(self, item: pytest.Item, keep_all: bool) -> None:
+        self.item = item
+        self.keep_all = keep_all
+        self.overhead_ms = 0.0
+
+    @classmethod
+    def for_item(cls, item: pytest.Item) -> Optional["ChunkTracer"]:
+        mode = tracing_mode(item.config)
+        return None if mode == "off" else cls(item, keep_all=(mode == "on"))
+
+    def start(self, context: BrowserContext) -> None:
+        t0 = time.perf_counter()
+        context.tracing.start_chunk(title=self.item.nodeid)
+        self.overhead_ms += (time.perf_counter() - t0) * 1000
+
+    def _should_keep(self) -> bool:
+        if self.keep_all or getattr(self.item, "execution_count", 1) > 1:  # pytest-rerunfailures
+            return True
+        reports = self.item.stash.get(_REPORTS, {})
+        return any(rep.failed for rep in reports.values())
+
+    def stop(self, context: BrowserContext) -> Optional[Path]:
+        t0 = time.perf_counter()
+        path = None
+        if self._should_keep():
+            safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.item.nodeid).strip("_")
+            attempt = getattr(self.item, "execution_count", 1)
+            path = TRACES_DIR / (f"{safe}-attempt{attempt}.zip" if attempt > 1 else f"{safe}.zip")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            context.tracing.stop_chunk(path=path)
+        else:
+            context.tracing.stop_chunk()
+        self.overhead_ms += (time.perf_counter() - t0) * 1000
+        self.item.user_properties.append(("trace_overhead_ms", round(self.overhead_ms, 1)))
+        if path:
+            self.item.user_properties.append(("trace", str(path)))
+        return path
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    rep = outcome.get_result()
+    if rep.when == "setup":
+        item.stash[_REPORTS] = {}  # fresh per attempt under reruns
+    item.stash.setdefault(_REPORTS, {})[rep.when] = rep
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    _stats.update(tests=0, overhead_ms=0.0, kept=0)
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    # read back from the report so the xdist controller sees every worker's chunks
+    if report.when != "teardown":
+        return
+    overhead = None
+    kept = False
+    for name, value in report.user_properties:
+        if name == "trace_overhead_ms":  # the last chunk wins; reruns keep appending
+            overhead, kept = value, False
+        elif name == "trace" and overhead is not None:
+            kept = True
+    if overhead is None:
+        return
+    _stats["tests"] += 1
+    _stats["overhead_ms"] += overhead
+    _stats["kept"] += kept
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config) -> None:
+    stats = _stats
+    if not stats["tests"]:
+        return
+    terminalreporter.write_line(
+        f"Tracing: {stats['kept']} trace(s) kept in {TRACES_DIR}, "
+        f"avg chunk overhead {stats['overhead_ms'] / stats['tests']:.1f} ms/test"
+    )
@@ -0,0 +1,72 @@
+"""HAR record/replay for the page fixture.
+
+``--har-mode=record`` captures each test's traffic to the app under test
+(``base_url``) into ``<har-dir>/<name>.zip``; ``--har-mode=replay`` serves
+those archives back through ``context.route_from_har`` so the suite runs
+without a live app.  ``<name>`` is the test's node id, or the flow name
+given by ``@pytest.mark.har("checkout")`` so tests exercising the same flow
+share one archive (the last recording wins).
+"""
+from __future__ import annotations
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from playwright.sync_api import BrowserContext
+
+MODES = ("off", "record", "replay")
+
+
+class HarArchive:
+    def __init__(self, mode: str, path: Path) -> None:
+        self.mode = mode
+        self.path = path
+
+    @property
+    def needs_fresh_context(self) -> bool:
+        # Recordings are flushed when the context closes, so pooled contexts can't record.
+        return self.mode == "record"
+
+    @property
+    def allows_blocking(self) -> bool:
+        # A recording must hold every app response a later replay may ask for,
+        # whichever --network-profile that replay runs with.
+        return self.mode != "record"
+
+    def install(self, context: BrowserContext, base_url: str) -> None:
+        url = f"{base_url.rstrip('/')}/**"
+        if self.mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            context.route_from_har(self.path, url=url, update=True, update_mode="minimal")
+        else:
+            context.route_from_har(self.path, url=url, not_found="abort")
+
+
+def archive_for(item: pytest.Item) -> Optional[HarArchive]:
+    mode = item.config.getoption("--har-mode")
+    if mode == "off":
+        return None
+    marker = item.get_closest_marker("har")
+    name = marker.args[0] if marker and marker.args else item.nodeid
+    safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_")
+    path = Path(item.config.getoption("--har-dir")) / f"{safe}.zip"
+    if mode == "replay" and not path.exists():
+        pytest.skip(f"no HAR recorded for {name!r} ({path}); run with --har-mode=record first")
+    return HarArchive(mode, path)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("har")
+    group.addoption(
+        "--har-mode",
+        choices=MODES,
+        default=os.getenv("PW_HAR_MODE", "off"),
+        help="record: capture app traffic per test/flow; replay: serve it from HAR with no live app",
+    )
+    group.addoption(
+        "--har-dir",
+        default=os.getenv("PW_HAR_DIR", "artifacts/har"),
+        help="Directory holding the HAR archives",
+    )
@@ -0,0 +1,28 @@
+from __future__ import annotations
+import sys
+
+import pytest
+
+from locators.score_store import SCORES_PATH, ScoreStore
+
+
+def pytest_sessionfinish(session, exitstatus) -> None:
+    # Workers only flush their own log; the controller (or a plain run)
+    # merges all logs into the snapshot once every worker is done.
+    smart = sys.modules.get("locators.smart_locator")
+    if smart is not None:
+        smart.SCORES.flush()
+    if not hasattr(session.config, "workerinput"):
+        ScoreStore(SCORES_PATH).compact()
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config) -> None:
+    smart = sys.modules.get("locators.smart_locator")
+    if smart is None:
+        return
+    stats = smart.CACHE_STATS
+    total = stats["hits"] + stats["misses"]
+    if total:
+        terminalreporter.write_line(
+            f"SmartLocator cache: {stats['hits']}/{total} hits ({100 * stats['hits'] / total:.0f}%)"
+        )
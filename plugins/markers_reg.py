@@ -7,6 +7,10 @@ _MARKERS: Iterable[str] = (
     "slow: long-running checks",
     "flaky: unstable under some conditions",
     "ai: exercises AI/LLM-assisted flows",
+    "isolated_context: needs a fresh BrowserContext instead of a pooled one",
+    "network_profile(name): override --network-profile for a test",
+    "har(name): share one HAR archive between tests of the same flow",
+    "allow_sleep: exempt a test from ENFORCE_NO_SLEEP",
 )
 
 def pytest_configure(config) -> None:
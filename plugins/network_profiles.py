@@ -0,0 +1,117 @@
+"""Request blocking profiles installed on the page fixture's context.
+
+Nothing in ``pages/*`` asserts on images, fonts or analytics, so most E2E
+tests can skip downloading them.  Pick a profile with
+``--network-profile`` (or ``PW_NETWORK_PROFILE``) and override it per test
+with ``@pytest.mark.network_profile("full")``.
+
+Blocked requests never reach the network, so "bytes saved" is an estimate
+from typical per-type sizes; the request counts are exact.
+"""
+from __future__ import annotations
+import os
+import re
+from collections import Counter
+from typing import Dict, FrozenSet, Optional, Pattern, Tuple
+
+import pytest
+from playwright.sync_api import BrowserContext, Route
+
+_ANALYTICS = re.compile(
+    r"google-analytics\.com|googletagmanager\.com|doubleclick\.net|googlesyndication\.com"
+    r"|facebook\.net|connect\.facebook|hotjar\.com|segment\.(io|com)|mixpanel\.com"
+    r"|clarity\.ms|newrelic\.com|nr-data\.net|intercom\.io|fullstory\.com",
+    re.I,
+)
+
+# profile -> (blocked resource types, blocked URL pattern)
+PROFILES: Dict[str, Tuple[FrozenSet[str], Optional[Pattern[str]]]] = {
+    "full": (frozenset(), None),
+    "no-media": (frozenset({"image", "media", "font"}), None),
+    "minimal": (frozenset({"image", "media", "font", "ping"}), _ANALYTICS),
+}
+
+EST_BYTES = {"image": 40_000, "media": 400_000, "font": 30_000, "script": 60_000, "ping": 500}
+DEFAULT_EST_BYTES = 5_000
+
+_stats: Counter = Counter()  # session totals: tests, requests, bytes
+
+
+class NetworkBlocker:
+    def __init__(self, profile: str) -> None:
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown network profile {profile!r}; choose from {sorted(PROFILES)}")
+        self.profile = profile
+        self.types, self.url_pattern = PROFILES[profile]
+        self.blocked: Counter = Counter()
+
+    @property
+    def active(self) -> bool:
+        return bool(self.types or self.url_pattern)
+
+    @property
+    def est_bytes_saved(self) -> int:
+        return sum(EST_BYTES.get(t, DEFAULT_EST_BYTES) * n for t, n in self.blocked.items())
+
+    def install(self, context: BrowserContext) -> None:
+        if self.active:
+            context.route("**/*", self._handle)
+
+    def _handle(self, route: Route) -> None:
+        request = route.request
+        kind = request.resource_type
+        if kind in self.types or (self.url_pattern and self.url_pattern.search(request.url)):
+            self.blocked[kind] += 1
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+
+def profile_for(item: pytest.Item) -> str:
+    marker = item.get_closest_marker("network_profile")
+    if marker and marker.args:
+        return marker.args[0]
+    return item.config.getoption("--network-profile")
+
+
+def record(item: pytest.Item, blocker: NetworkBlocker) -> None:
+    total = sum(blocker.blocked.values())
+    item.user_properties.append(("network_profile", blocker.profile))
+    item.user_properties.append(("network_blocked_requests", total))
+    item.user_properties.append(("network_est_bytes_saved", blocker.est_bytes_saved))
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("network-profiles")
+    group.addoption(
+        "--network-profile",
+        choices=sorted(PROFILES),
+        default=os.getenv("PW_NETWORK_PROFILE", "full"),
+        help="Block resources the page objects never assert on (default: full = block nothing)",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    _stats.clear()
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    # user_properties travel with the reports, so under xdist the controller sees every worker's counts
+    if report.when != "teardown":
+        return
+    props = dict(report.user_properties)
+    if "network_blocked_requests" not in props:
+        return
+    _stats["tests"] += 1
+    _stats["requests"] += props["network_blocked_requests"]
+    _stats["bytes"] += props["network_est_bytes_saved"]
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config) -> None:
+    stats = _stats
+    if not stats["requests"]:
+        return
+    terminalreporter.write_line(
+        f"Network profiles: blocked {stats['requests']} requests across {stats['tests']} tests "
+        f"(~{stats['bytes'] / 1_048_576:.1f} MiB est. saved)"
+    )
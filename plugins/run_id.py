@@ -0,0 +1,19 @@
+"""Pick the run id once, on the controller.
+
+xdist workers inherit it through ``PW_RUN_ID``, so per-run state (the AI
+budget ledger, audit and locator score logs, failure artifact directories)
+is shared by every process of one run and never by two runs.
+"""
+from __future__ import annotations
+import os
+import uuid
+
+import pytest
+
+from config.run import RUN_ID_ENV
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config: pytest.Config) -> None:
+    if not hasattr(config, "workerinput"):
+        os.environ.setdefault(RUN_ID_ENV, uuid.uuid4().hex)
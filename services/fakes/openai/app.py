@@ -0,0 +1,120 @@
+"""An OpenAI-compatible chat completions fake using FastAPI.
+
+It echoes the last user message with token usage so provider code can be
+exercised and benchmarked without network access or cost.  Latency, slow
+tail requests and errors (optionally with Retry-After, or only for the
+next N requests) can be injected through environment variables, per
+request with ``x-fake-*`` headers, or at runtime via ``POST /_fake/config``.
+"""
+import asyncio
+import os
+import random
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+app = FastAPI(title="Fake OpenAI")
+
+
+class FakeConfig(BaseModel):
+    latency_ms: float = Field(float(os.getenv("FAKE_OPENAI_LATENCY_MS", "0")), ge=0)
+    jitter_ms: float = Field(float(os.getenv("FAKE_OPENAI_JITTER_MS", "0")), ge=0)
+    error_rate: float = Field(float(os.getenv("FAKE_OPENAI_ERROR_RATE", "0")), ge=0, le=1)
+    error_status: int = Field(int(os.getenv("FAKE_OPENAI_ERROR_STATUS", "500")))
+    retry_after: Optional[float] = Field(None, description="Retry-After seconds sent with injected errors")
+    fail_next: int = Field(0, ge=0, description="Fail this many upcoming requests, then recover")
+    slow_rate: float = Field(0.0, ge=0, le=1, description="Fraction of requests that get slow_ms extra latency")
+    slow_ms: float = Field(0.0, ge=0)
+    slow_next: int = Field(0, ge=0, description="Give this many upcoming requests slow_ms extra latency")
+
+
+config = FakeConfig()
+stats: Dict[str, int] = {"requests": 0, "errors": 0}
+
+
+class Message(BaseModel):
+    role: str
+    content: str
+
+
+class ChatRequest(BaseModel):
+    model: str = "gpt-4o-mini"
+    messages: List[Message]
+    max_tokens: int = 600
+    temperature: float = 0.0
+
+
+@app.post("/_fake/config")
+def set_config(new: FakeConfig) -> FakeConfig:
+    """Replace the injected latency/error settings."""
+    global config
+    config = new
+    return config
+
+
+@app.get("/_fake/stats")
+def get_stats() -> Dict[str, int]:
+    return stats
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(req: ChatRequest, request: Request):
+    stats["requests"] += 1
+    headers = request.headers
+    # Decide the outcome on arrival, so a slow request still in flight can't
+    # consume fault injection meant for the requests that follow it.
+    cfg = config
+    latency = float(headers.get("x-fake-latency-ms", cfg.latency_ms)) + random.uniform(0, cfg.jitter_ms)
+    if cfg.slow_next:
+        cfg.slow_next -= 1
+        latency += cfg.slow_ms
+    elif random.random() < cfg.slow_rate:
+        latency += cfg.slow_ms
+    status = headers.get("x-fake-status")
+    if status is None and cfg.fail_next:
+        cfg.fail_next -= 1
+        status = cfg.error_status
+    if status is None and random.random() < cfg.error_rate:
+        status = cfg.error_status
+    if latency:
+        await asyncio.sleep(latency / 1000)
+    if status is not None and int(status) >= 400:
+        stats["errors"] += 1
+        extra = {"Retry-After": f"{cfg.retry_after:g}"} if cfg.retry_after is not None else {}
+        return JSONResponse({"error": {"message": "injected error", "type": "fake"}}, status_code=int(status),
+                            headers=extra)
+    prompt = next((m.content for m in reversed(req.messages) if m.role == "user"), "")
+    text = f"[FAKE] {prompt[:200]}"
+    return {
+        "id": f"chatcmpl-{stats['requests']}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": req.model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": max(1, sum(len(m.content) for m in req.messages) // 4),
+                  "completion_tokens": max(1, len(text) // 4)},
+    }
+
+
+def start_in_thread(timeout_sec: float = 10.0) -> Tuple["uvicorn.Server", threading.Thread, int]:
+    """Serve the fake on a free loopback port from a daemon thread; stop with ``server.should_exit = True``."""
+    import uvicorn
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + timeout_sec
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            server.should_exit = True
+            raise RuntimeError(f"fake OpenAI server did not start on port {port}")
+        time.sleep(0.01)
+    return server, thread, port
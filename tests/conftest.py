@@ -16,9 +16,10 @@ def fake() -> Faker:
     return Faker()
 
 @pytest.fixture(autouse=True)
-def forbid_time_sleep(monkeypatch: pytest.MonkeyPatch):
+def forbid_time_sleep(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch):
     # Default OFF to avoid breaking existing tests; enable via env when ready.
-    if os.getenv("ENFORCE_NO_SLEEP", "0") != "1":
+    # @pytest.mark.allow_sleep exempts tests that drive real subprocesses (Popen.wait polls with sleep).
+    if os.getenv("ENFORCE_NO_SLEEP", "0") != "1" or request.node.get_closest_marker("allow_sleep"):
         return
     def _no_sleep(seconds: _t.Any) -> None:
         raise AssertionError(f"time.sleep({seconds}) is forbidden. Use explicit waits instead.")
@@ -0,0 +1,113 @@
+import os
+
+import pytest
+
+import ai.cache
+from ai.cache import ResponseCache, cache_key, cacheable
+from ai.providers.base import AIProvider, AIResponse
+from ai.providers.cached import CachedProvider
+
+
+class Clock:
+    def __init__(self, now=1_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ai.cache, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = ResponseCache("explain", ttl_sec=60, max_entries=2, path=str(tmp_path / "ai_cache.sqlite"))
+    yield cache
+    cache.close()
+
+
+def test_entries_expire_after_ttl(cache, clock):
+    cache.put("k", {"text": "answer"})
+    clock.now += 59
+    assert cache.get("k") == {"text": "answer"}
+    clock.now += 2
+    assert cache.get("k") is None
+
+
+def test_least_recently_used_entry_is_evicted(cache, clock):
+    cache.put("a", {"n": 1})
+    clock.now += 1
+    cache.put("b", {"n": 2})
+    clock.now += 1
+    assert cache.get("a") == {"n": 1}  # a is now more recent than b
+    clock.now += 1
+    cache.put("c", {"n": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1} and cache.get("c") == {"n": 3}
+
+
+def test_namespaces_share_the_file_but_not_entries(cache, tmp_path):
+    other = ResponseCache("chat", ttl_sec=60, max_entries=2, path=cache.path)
+    other.put("k", {"text": "chat"})
+    assert cache.get("k") is None
+    other.close()
+
+
+def test_failures_and_stub_answers_are_not_cacheable():
+    assert cacheable("Use get_by_role('button', name='Checkout')")
+    assert not cacheable("[AI error] timed out")
+    assert not cacheable("[STUB AI]\nSystem=none")
+    assert cache_key("a", 1) == cache_key("a", 1) != cache_key("a", 2)
+
+
+class CountingProvider(AIProvider):
+    def __init__(self, fail=False):
+        super().__init__()
+        self.audit_log_path = os.devnull
+        self.fail = fail
+        self.calls = 0
+
+    def chat(self, prompt, system=None):
+        self.calls += 1
+        if self.fail:
+            return AIResponse(text="[AI error] boom", error="boom")
+        return AIResponse(text=f"answer to {prompt}", prompt_tokens=10, completion_tokens=5, cost_usd=0.002)
+
+
+class OtherProvider(CountingProvider):
+    pass
+
+
+def cached(inner, cache):
+    provider = CachedProvider(inner, cache=cache)
+    provider.audit_log_path = os.devnull
+    return provider
+
+
+def test_cached_provider_serves_repeats_for_free(cache):
+    inner = CountingProvider()
+    provider = cached(inner, cache)
+    first = provider.chat("why did it fail?", system="triage")
+    again = provider.chat("why did it fail?", system="triage")
+    assert inner.calls == 1
+    assert not first.cached and first.cost_usd == 0.002
+    assert again.cached and again.cost_usd == 0.0 and again.text == first.text
+    provider.chat("why did it fail?", system="other system")
+    inner.temperature = 0.7
+    provider.chat("why did it fail?", system="triage")
+    assert inner.calls == 3  # system prompt and temperature are part of the key
+    other = OtherProvider()
+    cached(other, cache).chat("why did it fail?", system="triage")
+    assert other.calls == 1  # same model, different provider
+
+
+def test_cached_provider_never_stores_errors(cache):
+    inner = CountingProvider(fail=True)
+    provider = cached(inner, cache)
+    provider.chat("p")
+    assert provider.chat("p").error == "boom"
+    assert inner.calls == 2
@@ -0,0 +1,119 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from flows.aio.checkout import CheckoutFlow
+from pages.aio.cart_page import CartPage
+from pages.aio.login_page import LoginPage
+from pages.aio.products_page import ProductsPage
+from pages.checkout_page import ShippingInfo
+
+LOGIN_HTML = """
+<input data-testid="login-username"><input data-testid="login-password" type="password">
+<button onclick="document.querySelector('[data-testid=login-error]').textContent =
+  document.querySelector('[data-testid=login-password]').value === 'secret' ? '' : 'Invalid credentials'">Sign In</button>
+<div data-testid="login-error"></div>
+"""
+
+PRODUCTS_HTML = """
+<h1>Products</h1>
+<div data-testid="product-backpack"><span>Backpack</span><button>Add to Cart</button></div>
+<div data-testid="product-bike-light"><span>Bike Light</span><button>Add to Cart</button></div>
+<ul data-testid="cart-items"></ul>
+<script>
+  for (const tile of document.querySelectorAll("[data-testid^=product-]")) {
+    tile.querySelector("button").addEventListener("click", () => {
+      const line = document.createElement("li");
+      line.textContent = tile.querySelector("span").textContent;
+      document.querySelector("[data-testid=cart-items]").append(line);
+    });
+  }
+</script>
+"""
+
+CHECKOUT_HTML = """
+<form onsubmit="event.preventDefault();
+  document.querySelector('[data-testid=order-confirmation]').textContent = 'Thank you for your order'">
+  <input data-testid="ship-first-name"><input data-testid="ship-last-name"><input data-testid="ship-address1">
+  <input data-testid="ship-city"><input data-testid="ship-zip"><input data-testid="ship-country">
+  <button>Place Order</button>
+</form>
+<div data-testid="order-confirmation"></div>
+"""
+
+SHIPPING = ShippingInfo("Ada", "Lovelace", "1 Analytical Way", "London", "N1", "UK")
+
+
+@pytest.fixture
+def apage(request):
+    try:
+        return request.getfixturevalue("async_page")
+    except Exception as e:  # no browser installed here
+        pytest.skip(f"browser unavailable: {e}")
+
+
+class ShopHandler(BaseHTTPRequestHandler):
+    """Serves the checkout page and records the JSON posted to the API."""
+
+    def do_GET(self):
+        body = CHECKOUT_HTML.encode() if self.path == "/checkout" else b""
+        self.send_response(200 if body else 404)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.posts.append((self.path, json.loads(data or b"{}")))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def shop():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ShopHandler)
+    server.posts = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_login_page_reports_a_failed_login(apage):
+    await apage.set_content(LOGIN_HTML)
+    login = LoginPage(apage)
+    await login.login("alice", "wrong")
+    await login.expect_error("Invalid credentials")
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_bulk_add_then_cart_check(apage):
+    await apage.set_content(PRODUCTS_HTML)
+    missed = await ProductsPage(apage).add_many_to_cart(["Backpack", "Bike Light", "Backpack"])
+    assert missed == ["Backpack"]  # the repeat went through add_to_cart
+    cart = CartPage(apage)
+    await cart.expect_items(["Backpack", "Backpack", "Bike Light"])
+    assert sorted(await cart.cart_snapshot()) == [("Backpack", 1), ("Backpack", 1), ("Bike Light", 1)]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_seeded_checkout_flow(apage, shop):
+    base_url = f"http://127.0.0.1:{shop.server_port}"
+    await CheckoutFlow(apage, base_url).buy_items(["Backpack", "Backpack"], SHIPPING, seeded=True,
+                                                  credentials=("alice", "secret"))
+    assert shop.posts == [
+        ("/api/login", {"username": "alice", "password": "secret"}),
+        ("/api/cart", {"items": [{"sku": "backpack", "quantity": 2}]}),
+    ]
@@ -0,0 +1,73 @@
+import gzip
+import json
+
+import pytest
+
+from ai.audit import AuditSink, summarize
+
+
+@pytest.fixture
+def sink(tmp_path, monkeypatch):
+    monkeypatch.setenv("PW_RUN_ID", "run-a")
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw0")
+    return AuditSink(tmp_path / "ai_audit.log", flush_every=3, flush_interval_sec=3600, max_bytes=10_000, backups=2)
+
+
+def call(model="gpt-4o-mini", latency_ms=100, cost_usd=0.001, **extra):
+    return {"model": model, "latency_ms": latency_ms, "cost_usd": cost_usd, "run": "run-a", **extra}
+
+
+def test_entries_are_buffered_until_flush_every(sink):
+    sink.write(call())
+    sink.write(call())
+    assert not sink.worker_path.exists()
+    sink.write(call())
+    assert sink.worker_path.name == "ai_audit.run-a.gw0.log"
+    assert len(sink.worker_path.read_text().splitlines()) == 3
+
+
+def test_merge_takes_only_this_runs_worker_logs(sink, tmp_path, monkeypatch):
+    other_run = tmp_path / "ai_audit.run-b.gw0.log"
+    other_run.write_text(json.dumps(call(run="run-b")) + "\n")
+    sink.write(call())
+    sink.flush()
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    (tmp_path / "ai_audit.run-a.gw1.log").write_text(json.dumps(call()) + "\n" + '{"model": "tor')
+    assert sink.merge() == 2  # the torn line of a killed worker is dropped
+    assert len(sink.path.read_text().splitlines()) == 2
+    assert other_run.exists() and sink.worker_logs() == []
+
+
+def test_full_log_rotates_to_gzip_archives(sink):
+    line = json.dumps(call(prompt="x" * 4_000)) + "\n"
+    for _ in range(5):
+        sink._append(sink.path, line.encode())
+    archives = sorted(p.name for p in sink.path.parent.glob("ai_audit.log.*.gz"))
+    assert archives == ["ai_audit.log.1.gz", "ai_audit.log.2.gz"]  # the oldest beyond backups=2 is dropped
+    with gzip.open(sink.path.with_name("ai_audit.log.1.gz"), "rt") as f:
+        assert len(f.read().splitlines()) == 2
+    assert len(list(sink.entries(rotated=True))) == 5
+    assert len(list(sink.entries(rotated=False))) == 1
+
+
+def test_merge_includes_rotated_worker_segments(sink):
+    sink.max_bytes, sink.backups, sink.flush_every = 1_000, 5, 1
+    for i in range(12):
+        sink.write(call(prompt=f"{i:02d}" + "x" * 200))
+    assert sink.archives(sink.worker_path)  # the worker log rotated while writing
+    assert sink.merge() == 12
+    assert list(sink.path.parent.glob("ai_audit.run-a.*")) == []
+    assert sorted(e["prompt"][:2] for e in sink.entries()) == [f"{i:02d}" for i in range(12)]
+
+
+def test_summarize():
+    entries = [call(latency_ms=ms) for ms in range(10, 110, 10)]
+    entries += [call(model="gpt-4o", cost_usd=0.01, error="timeout"), {"event": "explain_cache", "hit": True}]
+    entries += [call(provider="cache", cached=True, latency_ms=1), call(error="circuit open", rejected=True)]
+    entries += [call(disabled=True, latency_ms=0)]
+    stats = summarize(entries)
+    assert stats["calls"] == 11 and stats["errors"] == 1
+    assert stats["cache_hits"] == 1 and stats["rejected"] == 1
+    assert stats["error_rate"] == pytest.approx(1 / 11)
+    assert stats["p50_latency_ms"] == pytest.approx(60)
+    assert stats["cost_by_model"] == {"gpt-4o-mini": pytest.approx(0.01), "gpt-4o": pytest.approx(0.01)}
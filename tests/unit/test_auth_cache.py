@@ -0,0 +1,100 @@
+import json
+import os
+import stat
+import time
+
+import pytest
+
+from flows import auth_cache
+from flows.auth_cache import StorageStateCache
+
+STATE = {"cookies": [{"name": "sid", "value": "abc", "expires": -1}], "origins": []}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return StorageStateCache(tmp_path / "auth", ttl_sec=60, sleep=lambda sec: None)
+
+
+def test_store_round_trips_with_private_permissions(cache):
+    key = cache.key("https://shop.test/", "alice", "admin")
+    assert key == cache.key("https://shop.test", "alice", "admin")
+    assert cache.load(key) is None
+
+    cache.store(key, STATE)
+    assert cache.load(key) == STATE
+    assert stat.S_IMODE(os.stat(cache.root).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(cache.root / f"{key}.json").st_mode) == 0o600
+    # the temp file was renamed into place, not left behind
+    assert [p.name for p in cache.root.iterdir()] == [f"{key}.json"]
+
+    cache.invalidate(key)
+    assert cache.load(key) is None
+
+
+def test_store_replaces_existing_snapshot(cache):
+    cache.store("k", STATE)
+    fresh = {"cookies": [], "origins": [{"origin": "https://shop.test"}]}
+    cache.store("k", fresh)
+    assert cache.load("k") == fresh
+
+
+def test_snapshot_expires_after_ttl(cache, monkeypatch):
+    cache.store("k", STATE)
+    now = time.time()
+    monkeypatch.setattr(auth_cache.time, "time", lambda: now + 61)
+    assert cache.load("k") is None
+
+
+def test_expired_cookie_invalidates_snapshot(cache):
+    expired = {"cookies": [{"name": "sid", "value": "abc", "expires": time.time() - 5}]}
+    cache.store("k", expired)
+    assert cache.load("k") is None
+
+
+def test_corrupt_snapshot_is_a_miss(cache):
+    (cache.root / "k.json").write_text('{"created": ')
+    assert cache.load("k") is None
+
+
+def test_lock_is_exclusive_and_released(cache):
+    with cache.lock("k"):
+        assert (cache.root / "k.lock").exists()
+        with pytest.raises(FileExistsError):
+            os.open(cache.root / "k.lock", os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    assert not (cache.root / "k.lock").exists()
+
+
+def test_lock_waits_for_holder_then_times_out(tmp_path):
+    waits = []
+    cache = StorageStateCache(tmp_path, sleep=waits.append)
+    (tmp_path / "k.lock").touch()
+    with pytest.raises(TimeoutError):
+        with cache.lock("k", timeout_sec=0):
+            pass
+    assert waits == []
+
+    def holder_exits(sec):
+        waits.append(sec)
+        (tmp_path / "k.lock").unlink()
+
+    cache.sleep = holder_exits
+    with cache.lock("k", timeout_sec=5):
+        pass
+    assert len(waits) == 1 and 0 < waits[0] <= auth_cache.LOCK_POLL_SEC
+
+
+def test_stale_lock_is_taken_over(cache):
+    lock_path = cache.root / "k.lock"
+    lock_path.touch()
+    old = time.time() - auth_cache.LOCK_STALE_SEC - 1
+    os.utime(lock_path, (old, old))
+    with cache.lock("k", timeout_sec=0):
+        assert lock_path.exists()
+    assert not lock_path.exists()
+
+
+def test_snapshot_file_is_plain_json(cache):
+    cache.store("k", STATE)
+    entry = json.loads((cache.root / "k.json").read_text())
+    assert entry["state"] == STATE and entry["created"] <= time.time()
@@ -0,0 +1,87 @@
+import pytest
+
+from pages.base_page import FILL_FORM_JS, BasePage, FormFillError
+
+FORM_HTML = """
+<input data-testid="first-name"><textarea data-testid="notes"></textarea>
+<input data-testid="late" style="display: none">
+<input data-testid="locked" readonly>
+<script>setTimeout(() => { document.querySelector("[data-testid=late]").style.display = "" }, 200);</script>
+"""
+
+
+class FakeLocator:
+    def __init__(self, page, test_id):
+        self.page = page
+        self.test_id = test_id
+
+    def wait_for(self, state, timeout):
+        pass
+
+    def fill(self, value):
+        if self.test_id in self.page.unfillable:
+            raise TimeoutError(f"{self.test_id} is not editable\nCall log: ...")
+        self.page.filled.append((self.test_id, value))
+
+
+class FakePage:
+    """Page whose in-page fill reports ``errors`` and whose locators fill unless ``unfillable``."""
+
+    def __init__(self, errors, unfillable=()):
+        self.errors = errors
+        self.unfillable = set(unfillable)
+        self.evaluated = []
+        self.filled = []
+
+    def evaluate(self, script, arg):
+        self.evaluated.append(arg)
+        return dict(self.errors)
+
+    def get_by_test_id(self, test_id):
+        return FakeLocator(self, test_id)
+
+
+def test_fill_form_is_one_evaluate_when_every_field_fills():
+    page = FakePage({})
+    BasePage(page).fill_form({"first-name": "Ada", "notes": "hi"})
+    assert page.evaluated == [{"fields": [("first-name", "Ada"), ("notes", "hi")], "attr": "data-testid"}]
+    assert page.filled == []
+
+
+def test_fill_form_retries_failed_fields_one_by_one():
+    page = FakePage({"late": "not visible", "locked": "disabled or read-only"}, unfillable={"locked"})
+    with pytest.raises(FormFillError) as exc:
+        BasePage(page).fill_form({"first-name": "Ada", "late": "x", "locked": "y"})
+    assert page.filled == [("late", ""), ("late", "x")]
+    assert exc.value.errors == {"locked": "locked is not editable"}
+
+
+def test_fill_form_without_fallback_raises_the_in_page_errors():
+    page = FakePage({"late": "not visible"})
+    with pytest.raises(FormFillError, match=r"late \(not visible\)"):
+        BasePage(page).fill_form({"late": "x"}, fallback=False)
+    assert page.filled == []
+
+
+@pytest.fixture
+def form_page(request):
+    try:
+        page = request.getfixturevalue("page")
+    except Exception as e:  # no browser installed here
+        pytest.skip(f"browser unavailable: {e}")
+    page.set_content(FORM_HTML)
+    return page
+
+
+def test_fill_form_in_a_real_page(form_page):
+    errors = form_page.evaluate(FILL_FORM_JS, {"fields": [["first-name", "Ada"], ["late", "x"], ["locked", "y"],
+                                                          ["missing", "z"]], "attr": "data-testid"})
+    assert errors == {"late": "not visible", "locked": "disabled or read-only", "missing": "not found"}
+
+    form_page.set_content(FORM_HTML)
+    page = BasePage(form_page, default_timeout_ms=2000)
+    with pytest.raises(FormFillError) as exc:
+        page.fill_form({"first-name": "Ada", "notes": "line", "late": "shown later", "locked": "y"})
+    assert set(exc.value.errors) == {"locked"}  # the late field was filled by the fallback
+    values = [form_page.get_by_test_id(t).input_value() for t in ("first-name", "notes", "late")]
+    assert values == ["Ada", "line", "shown later"]
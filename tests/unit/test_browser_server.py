@@ -0,0 +1,42 @@
+import sys
+import time
+
+import pytest
+
+from plugins import browser_server
+
+# BrowserServer.stop() uses Popen.wait(timeout=...), which polls with time.sleep.
+pytestmark = pytest.mark.allow_sleep
+
+
+def fake_driver(monkeypatch: pytest.MonkeyPatch, script: str) -> None:
+    monkeypatch.setattr(browser_server, "compute_driver_executable", lambda: [sys.executable, "-c", script, "--"])
+
+
+def test_start_reads_ws_endpoint(monkeypatch):
+    fake_driver(monkeypatch, "import time; print('ws://127.0.0.1:1/x', flush=True); time.sleep(30)")
+    server = browser_server.BrowserServer()
+    try:
+        assert server.start(timeout_sec=10) == "ws://127.0.0.1:1/x"
+    finally:
+        server.stop()
+
+
+def test_start_gives_up_on_a_silent_driver(monkeypatch):
+    fake_driver(monkeypatch, "import time; time.sleep(30)")
+    server = browser_server.BrowserServer()
+    t0 = time.monotonic()
+    with pytest.raises(RuntimeError, match="no endpoint within"):
+        server.start(timeout_sec=0.5)
+    assert time.monotonic() - t0 < 5
+    assert server._proc is None
+
+
+def test_prelaunch_stop_does_not_wait_for_a_hung_start(monkeypatch):
+    fake_driver(monkeypatch, "import time; time.sleep(30)")
+    prelaunch = browser_server.Prelaunch()
+    t0 = time.monotonic()
+    prelaunch.stop(timeout_sec=5)
+    assert time.monotonic() - t0 < 5
+    assert not prelaunch._thread.is_alive()
+    assert prelaunch.endpoint(timeout_sec=0) is None
@@ -0,0 +1,54 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from ai.budget import BudgetLedger, feature
+
+
+@pytest.fixture
+def ledger_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("PW_RUN_ID", "run-a")
+    return str(tmp_path / "ai_budget.sqlite")
+
+
+def test_reserve_commit_refund(ledger_path):
+    ledger = BudgetLedger(1.0, path=ledger_path)
+    with feature("triage"):
+        first = ledger.reserve(0.6)
+    second = ledger.reserve(0.3)
+    assert first is not None and second is not None
+    assert ledger.reserve(0.2) is None  # 0.9 held, 0.2 more would pass the ceiling
+    ledger.commit(first, 0.05)  # the call was cheaper than its worst case
+    ledger.refund(second)  # and this one failed
+    assert ledger.spent == pytest.approx(0.05)
+    assert ledger.remaining == pytest.approx(0.95)
+    assert ledger.reserve(0.9) is not None
+    report = ledger.report()
+    assert report["features"] == {"triage": {"calls": 1, "cost_usd": pytest.approx(0.05)}}
+    assert report["held_usd"] == pytest.approx(0.9)
+    ledger.close()
+
+
+def test_spend_is_scoped_to_the_run(ledger_path, monkeypatch):
+    ledger = BudgetLedger(1.0, path=ledger_path)
+    ledger.add(1.0)
+    assert ledger.exhausted
+    monkeypatch.setenv("PW_RUN_ID", "run-b")
+    assert not ledger.exhausted and ledger.remaining == 1.0
+    ledger.close()
+
+
+def _reserve_many(path: str) -> int:
+    ledger = BudgetLedger(1.0, path=path)
+    granted = sum(ledger.reserve(0.01) is not None for _ in range(50))
+    ledger.close()
+    return granted
+
+
+def test_ceiling_holds_across_processes(ledger_path):
+    setup = BudgetLedger(1.0, path=ledger_path)
+    assert setup.remaining == 1.0  # creates the schema before the workers race
+    setup.close()
+    with ProcessPoolExecutor(4) as pool:
+        granted = sum(pool.map(_reserve_many, [ledger_path] * 4))
+    assert granted == 100
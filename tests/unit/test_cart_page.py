@@ -0,0 +1,59 @@
+import json
+import subprocess
+from collections import Counter
+
+import pytest
+from playwright._impl._driver import compute_driver_executable
+
+from pages.cart_page import CART_DIFF_JS, diff_report
+
+# Minimal stand-in for the cart-items container: just what CART_SNAPSHOT_JS reads.
+FAKE_DOM = """
+const line = l => ({
+  textContent: l.text,
+  querySelector: sel => sel.includes("cart-item-name")
+    ? (l.name === undefined ? null : { textContent: l.name })
+    : (l.qty === undefined ? null : (l.input ? { value: l.qty, textContent: "" } : { textContent: l.qty })),
+});
+globalThis.document = { querySelector: () => ({ children: LINES.map(line) }) };
+"""
+
+
+def cart_diff(lines, names):
+    script = (f"const LINES = {json.dumps(lines)};\n{FAKE_DOM}\n"
+              f"console.log(JSON.stringify(({CART_DIFF_JS})({{ selector: 'x', expected: {json.dumps(Counter(names))} }})));")
+    out = subprocess.run([compute_driver_executable()[0], "-e", script], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def test_matching_cart_with_repeated_lines_and_quantities():
+    lines = [{"text": "Backpack $29.99 Remove"}, {"text": "Backpack $29.99 Remove"},
+             {"text": "Bike Light", "name": "Bike Light", "qty": "3", "input": True}]
+    diff = cart_diff(lines, ["Backpack", "Backpack", "Bike Light", "Bike Light", "Bike Light"])
+    assert diff == {"missing": [], "unexpected": [], "lines": 3}
+
+
+def test_quantity_shortfall_and_extra_lines_are_reported():
+    lines = [{"text": "Backpack $29.99"}, {"text": "Onesie", "name": "Onesie", "qty": "Qty: 2"}]
+    diff = cart_diff(lines, ["Backpack", "Backpack", "Onesie"])
+    assert diff["missing"] == [["Backpack", 2, 1]]
+    assert diff["unexpected"] == [["Onesie", 1]]
+
+
+@pytest.mark.parametrize("line", [{"text": "T-Shirt $15.99"}, {"text": "Shirts $9"}, {"text": "T-Shirt", "name": "T-Shirt"}])
+def test_a_name_is_not_satisfied_by_a_longer_product(line):
+    diff = cart_diff([line], ["Shirt"])
+    assert diff["missing"] == [["Shirt", 1, 0]]
+    assert diff["unexpected"] == [[line.get("name", line["text"]), 1]]
+
+
+def test_longest_expected_name_owns_the_line():
+    lines = [{"text": "Shirt $9"}, {"text": "Shirt Deluxe $19"}]
+    assert cart_diff(lines, ["Shirt", "Shirt Deluxe"]) == {"missing": [], "unexpected": [], "lines": 2}
+
+
+def test_diff_report():
+    report = diff_report({"missing": [["Backpack", 2, 1]], "unexpected": [["Onesie", 1]], "lines": 2},
+                         {"Backpack": 2, "Onesie": 0})
+    assert report == ("Cart does not match the 2 expected items: missing Backpack (want 2, got 1); "
+                      "unexpected Onesie x1; cart has 2 lines")
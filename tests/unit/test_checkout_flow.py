@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+from flows.auth import LOGIN_API_PATH
+from flows.checkout import CART_API_PATH, CheckoutFlow, cart_payload
+
+
+class FakeRequest:
+    def __init__(self):
+        self.posts = []
+
+    def post(self, url, data, fail_on_status_code):
+        assert fail_on_status_code
+        self.posts.append((url, data))
+
+
+def fake_page():
+    return SimpleNamespace(context=SimpleNamespace(request=FakeRequest()))
+
+
+def test_cart_payload_aggregates_repeated_products():
+    payload = cart_payload(["Backpack", "Bike Light", "Backpack", "backpack"])
+    assert payload == {"items": [{"sku": "backpack", "quantity": 3}, {"sku": "bike-light", "quantity": 1}]}
+    assert cart_payload([]) == {"items": []}
+
+
+def test_seed_cart_posts_one_request():
+    page = fake_page()
+    CheckoutFlow(page, "https://shop.test").seed_cart(["Backpack", "Backpack"])
+    assert page.context.request.posts == [
+        (f"https://shop.test{CART_API_PATH}", {"items": [{"sku": "backpack", "quantity": 2}]}),
+    ]
+
+
+def test_seed_cart_logs_in_through_the_api_first():
+    page = fake_page()
+    CheckoutFlow(page, "https://shop.test").seed_cart(["Onesie"], credentials=("alice", "secret"))
+    assert page.context.request.posts == [
+        (f"https://shop.test{LOGIN_API_PATH}", {"username": "alice", "password": "secret"}),
+        (f"https://shop.test{CART_API_PATH}", {"items": [{"sku": "onesie", "quantity": 1}]}),
+    ]
@@ -0,0 +1,49 @@
+from plugins.failure_artifacts import ArtifactWriter
+
+
+class Terminal:
+    def __init__(self):
+        self.lines = []
+
+    def write_line(self, line, **markup):
+        self.lines.append(line)
+
+
+def test_writes_screenshot_dom_and_index(tmp_path):
+    writer = ArtifactWriter(tmp_path)
+    writer.submit("tests/test_a.py::test_x[1]", b"jpeg", "<html>same</html>")
+    writer.submit("tests/test_a.py::test_y", b"", "<html>same</html>")
+    writer.drain()
+    assert (tmp_path / "tests_test_a.py_test_x_1.jpg").read_bytes() == b"jpeg"
+    assert len(list((tmp_path / "dom").iterdir())) == 1
+    assert len(writer.index.read_text().splitlines()) == 2
+    assert writer.dropped == 0
+
+
+def test_failed_writes_are_counted_not_raised(tmp_path, monkeypatch):
+    writer = ArtifactWriter(tmp_path, max_pending=1)
+    monkeypatch.setattr(writer, "_write", lambda *job: (_ for _ in ()).throw(OSError("disk full")))
+    # the first job goes to the background thread; the queue then fills and the rest write inline
+    for i in range(5):
+        writer.submit(f"t.py::test_{i}", b"jpeg", "")
+    writer.drain()
+    assert writer.dropped == 5
+    assert "OSError: disk full" in writer.last_error
+
+
+def test_dropped_artifacts_are_reported(tmp_path, monkeypatch):
+    from plugins import failure_artifacts
+
+    monkeypatch.setattr(failure_artifacts, "writer", ArtifactWriter(tmp_path))
+    terminal = Terminal()
+    failure_artifacts.pytest_terminal_summary(terminal, 0, None)
+    assert terminal.lines == []
+
+    class Node:
+        workeroutput = {"artifacts_dropped": 2, "artifacts_last_error": "t.py::a: OSError: disk full"}
+
+    failure_artifacts.pytest_testnodedown(Node(), None)
+    failure_artifacts.pytest_terminal_summary(terminal, 0, None)
+    assert terminal.lines == [
+        f"Failure artifacts: 2 not written to {tmp_path} (last error: t.py::a: OSError: disk full)"
+    ]
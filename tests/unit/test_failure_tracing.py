@@ -0,0 +1,31 @@
+import pytest
+
+from plugins import failure_tracing
+
+
+class Terminal:
+    def __init__(self):
+        self.lines = []
+
+    def write_line(self, line):
+        self.lines.append(line)
+
+
+def report(when, props):
+    return pytest.TestReport("t.py::a", ("t.py", 0, "a"), {}, "passed", None, when, user_properties=props)
+
+
+def test_summary_is_built_from_reports(monkeypatch):
+    monkeypatch.setattr(failure_tracing, "_stats", {"tests": 0, "overhead_ms": 0.0, "kept": 0})
+    failure_tracing.pytest_runtest_logreport(report("call", [("trace_overhead_ms", 99.0)]))
+    failure_tracing.pytest_runtest_logreport(report("teardown", [("trace_overhead_ms", 4.0)]))
+    # a rerun: the first attempt's properties are still on the item
+    failure_tracing.pytest_runtest_logreport(report("teardown", [
+        ("trace_overhead_ms", 5.0), ("trace", "artifacts/traces/a.zip"), ("trace_overhead_ms", 2.0),
+    ]))
+    failure_tracing.pytest_runtest_logreport(report("teardown", [("trace_overhead_ms", 6.0), ("trace", "b.zip")]))
+    terminal = Terminal()
+    failure_tracing.pytest_terminal_summary(terminal, 0, None)
+    assert terminal.lines == [
+        f"Tracing: 1 trace(s) kept in {failure_tracing.TRACES_DIR}, avg chunk overhead 4.0 ms/test"
+    ]
@@ -0,0 +1,48 @@
+from pages import lazy
+from pages.base_page import BasePage
+from pages.lazy import LazyLocator
+
+
+class FakePage:
+    def __init__(self):
+        self.built = []
+
+    def get_by_test_id(self, test_id):
+        self.built.append(("test_id", test_id))
+        return ("test_id", test_id)
+
+    def get_by_role(self, role, name=None):
+        self.built.append(("role", role, name))
+        return ("role", role, name)
+
+    def locator(self, selector):
+        self.built.append(("css", selector))
+        return ("css", selector)
+
+
+class CartPage(BasePage):
+    __slots__ = ()
+
+    checkout_btn = lazy.role("button", name="Checkout")
+    cart_link = lazy.test_id("cart-link")
+    items = lazy.css("[data-testid='cart-items']")
+
+
+def test_locators_are_built_on_first_access_and_cached_per_instance():
+    page = FakePage()
+    cart = CartPage(page)
+    assert page.built == []  # constructing the page object builds nothing
+    assert cart.checkout_btn == ("role", "button", "Checkout")
+    assert cart.checkout_btn is cart.checkout_btn
+    assert cart.cart_link == ("test_id", "cart-link")
+    assert page.built == [("role", "button", "Checkout"), ("test_id", "cart-link")]
+
+    other = CartPage(page)
+    assert other.items == ("css", "[data-testid='cart-items']")
+    assert other.checkout_btn == cart.checkout_btn
+    assert len(page.built) == 4  # a second page object builds its own
+
+
+def test_class_access_returns_the_descriptor():
+    assert isinstance(CartPage.checkout_btn, LazyLocator)
+    assert CartPage.checkout_btn.name == "checkout_btn"
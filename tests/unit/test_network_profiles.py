@@ -0,0 +1,29 @@
+from collections import Counter
+
+import pytest
+
+from plugins import network_profiles
+
+
+class Terminal:
+    def __init__(self):
+        self.lines = []
+
+    def write_line(self, line):
+        self.lines.append(line)
+
+
+def teardown_report(nodeid, blocked, saved):
+    props = [("network_profile", "minimal"), ("network_blocked_requests", blocked),
+             ("network_est_bytes_saved", saved)]
+    return pytest.TestReport(nodeid, ("t.py", 0, nodeid), {}, "passed", None, "teardown", user_properties=props)
+
+
+def test_summary_counts_reports_from_any_process(monkeypatch):
+    monkeypatch.setattr(network_profiles, "_stats", Counter())
+    # as the xdist controller receives them: only reports, no record() calls in this process
+    network_profiles.pytest_runtest_logreport(teardown_report("t.py::a", 3, 120_000))
+    network_profiles.pytest_runtest_logreport(teardown_report("t.py::b", 2, 1_048_576))
+    terminal = Terminal()
+    network_profiles.pytest_terminal_summary(terminal, 0, None)
+    assert terminal.lines == ["Network profiles: blocked 5 requests across 2 tests (~1.1 MiB est. saved)"]
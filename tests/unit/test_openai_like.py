@@ -0,0 +1,228 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+
+import httpx
+import pytest
+
+from ai.budget import BudgetLedger
+from ai.providers import openai_like
+from ai.providers.openai_like import OpenAILikeProvider
+from ai.providers.resilience import CircuitBreaker, backoff_delay, retry_after
+from services.fakes.openai.app import start_in_thread
+
+
+@pytest.fixture(scope="module")
+def fake_url():
+    server, thread, port = start_in_thread()
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join()
+
+
+@pytest.fixture
+def fake(fake_url):
+    def configure(**settings):
+        httpx.post(f"{fake_url}/_fake/config", json=settings).raise_for_status()
+
+    configure()
+    yield configure
+    configure()
+
+
+@pytest.fixture
+def provider(fake_url, tmp_path, monkeypatch):
+    monkeypatch.setattr(openai_like, "AI_RETRY_BASE_SEC", 0.01)
+    monkeypatch.setenv("AI_API_KEY", "fake")
+    monkeypatch.setenv("AI_BASE_URL", f"{fake_url}/v1")
+    monkeypatch.setenv("PW_RUN_ID", "unit")
+    prov = OpenAILikeProvider()
+    prov.audit_log_path = os.devnull
+    prov.budget = BudgetLedger(10.0, path=str(tmp_path / "ai_budget.sqlite"))
+    prov.audits = []
+    prov.audit = prov.audits.append
+    prov.slept = []
+    prov.sleep = prov.slept.append
+    yield prov
+    prov.close()
+    prov.budget.close()
+
+
+def server_requests(fake_url):
+    return httpx.get(f"{fake_url}/_fake/stats").json()["requests"]
+
+
+def warm_latency(prov, calls=20):
+    for i in range(calls):
+        assert prov.chat(f"warm {i}").error is None
+
+
+def run_async(coro):
+    # A sync Playwright session started by an earlier test keeps a loop running on this thread.
+    with ThreadPoolExecutor(1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+def cool_down(breaker):
+    breaker.opened_at -= breaker.cooldown_sec
+
+
+def test_hedged_call_charges_both_requests(provider, fake):
+    provider.hedge = True
+    warm_latency(provider)
+    fake(slow_next=1, slow_ms=400)
+    resp = provider.chat("hedge me")
+    assert resp.error is None
+    # the slow first request finishes in the background and is charged to the second reservation
+    provider._hedge_pool.shutdown(wait=True)
+    assert provider.budget.report()["held_usd"] == 0
+    features = provider.budget.report()["features"]["other"]
+    assert features["calls"] == 22
+    assert features["cost_usd"] == pytest.approx(provider.budget.spent)
+
+
+def test_async_hedge_charges_the_cancelled_request_in_full(provider, fake):
+    provider.hedge = True
+    warm_latency(provider)
+    spent = provider.budget.spent
+    fake(slow_next=1, slow_ms=400)
+
+    async def run():
+        try:
+            return await provider.achat("hedge me")
+        finally:
+            await provider.aclose()
+
+    resp = run_async(run())
+    assert resp.error is None
+    report = provider.budget.report()
+    assert report["held_usd"] == 0 and report["features"]["other"]["calls"] == 22
+    # the abandoned request may still be billed, so it keeps its worst-case reservation
+    worst = provider._worst_case_cost("hedge me")
+    assert provider.budget.spent - spent == pytest.approx(resp.cost_usd + worst)
+
+
+def test_retries_429_after_retry_after(provider, fake):
+    fake(fail_next=1, error_status=429, retry_after=0.3)
+    resp = provider.chat("rate limited")
+    assert resp.error is None
+    assert provider.slept == [0.3]
+    assert provider.audits[-1]["attempts"] == 2
+
+
+def test_retries_5xx_with_backoff_then_gives_up(provider, fake):
+    fake(fail_next=2, error_status=503)
+    assert provider.chat("flaky").error is None
+    assert provider.audits[-1]["attempts"] == 3
+    assert len(provider.slept) == 2 and all(0 <= s <= 0.02 for s in provider.slept)
+    fake(fail_next=3, error_status=503)
+    resp = provider.chat("down")
+    assert "503" in resp.error and provider.audits[-1]["attempts"] == 3
+    assert provider.budget.report()["held_usd"] == 0
+
+
+def test_does_not_retry_client_errors_or_long_retry_after(provider, fake, monkeypatch):
+    fake(fail_next=1, error_status=400)
+    assert "400" in provider.chat("bad request").error
+    assert provider.audits[-1]["attempts"] == 1
+    monkeypatch.setattr(openai_like, "AI_RETRY_MAX_SEC", 1)
+    fake(fail_next=1, error_status=429, retry_after=60)
+    assert "429" in provider.chat("come back in a minute").error
+    assert provider.audits[-1]["attempts"] == 1
+    assert provider.slept == []
+
+
+def test_breaker_opens_then_lets_one_trial_through(provider, fake, fake_url):
+    provider.retries = 0
+    provider.breaker = CircuitBreaker(threshold=3, cooldown_sec=30)
+    fake(error_rate=1, error_status=500)
+    for _ in range(3):
+        assert "500" in provider.chat("failing").error
+    assert provider.breaker.state == "open"
+    sent = server_requests(fake_url)
+    assert provider.chat("rejected").error == "circuit open"
+    assert provider.audits[-1]["rejected"] is True
+    assert server_requests(fake_url) == sent  # failed fast, nothing sent
+
+    cool_down(provider.breaker)
+    assert provider.breaker.state == "half-open"
+    assert "500" in provider.chat("trial fails").error
+    assert provider.breaker.state == "open"  # one failed trial re-opens it
+
+    fake()
+    cool_down(provider.breaker)
+    assert provider.chat("trial succeeds").error is None
+    assert provider.breaker.state == "closed"
+
+
+def test_cancelled_half_open_trial_frees_the_slot(provider, fake):
+    provider.retries = 0
+    provider.breaker = CircuitBreaker(threshold=1, cooldown_sec=30)
+    fake(fail_next=1, error_status=500)
+    assert "500" in provider.chat("failing").error
+    cool_down(provider.breaker)
+    fake(slow_next=1, slow_ms=1000)
+
+    async def run():
+        try:
+            await asyncio.wait_for(provider.achat("abandoned trial"), timeout=0.2)
+        finally:
+            await provider.aclose()
+
+    with pytest.raises(asyncio.TimeoutError):
+        run_async(run())
+    # the cancelled trial had no outcome: still half-open, and the next call may try again
+    assert provider.breaker.state == "half-open"
+    assert provider.budget.report()["held_usd"] == 0
+    assert provider.chat("next trial").error is None
+    assert provider.breaker.state == "closed"
+
+
+def test_hedge_fires_after_p95(provider, fake):
+    provider.hedge = True
+    assert provider._hedge_delay() is None  # too few samples yet
+    warm_latency(provider)
+    assert provider._hedge_delay() >= openai_like.AI_HEDGE_MIN_MS / 1000
+    fake(slow_next=1, slow_ms=2000)
+    t0 = time.monotonic()
+    assert provider.chat("slow first copy").error is None
+    assert time.monotonic() - t0 < 1.5
+    assert provider.audits[-1]["hedged"] is True
+
+
+def test_no_hedge_when_disabled(provider, fake):
+    warm_latency(provider)
+    fake(slow_next=1, slow_ms=300)
+    t0 = time.monotonic()
+    assert provider.chat("waits it out").error is None
+    assert time.monotonic() - t0 >= 0.3
+    assert "hedged" not in provider.audits[-1]
+
+
+def test_backoff_and_retry_after_parsing():
+    assert all(0 <= backoff_delay(attempt, 0.5, 2.0) <= min(2.0, 0.5 * 2 ** attempt) for attempt in range(6))
+    request = httpx.Request("POST", "http://fake/v1/chat/completions")
+
+    def error(headers):
+        response = httpx.Response(429, headers=headers, request=request)
+        return httpx.HTTPStatusError("429", request=request, response=response)
+
+    assert retry_after(error({"Retry-After": "7"})) == 7.0
+    assert 25 <= retry_after(error({"Retry-After": formatdate(time.time() + 30, usegmt=True)})) <= 30
+    assert retry_after(error({})) is None
+    assert retry_after(error({"Retry-After": "soon"})) is None
+
+
+def test_async_path_retries_too(provider, fake):
+    fake(fail_next=1, error_status=502)
+
+    async def run():
+        try:
+            return await provider.achat("async flaky")
+        finally:
+            await provider.aclose()
+
+    assert run_async(run()).error is None
+    assert provider.audits[-1]["attempts"] == 2
@@ -0,0 +1,52 @@
+import json
+import subprocess
+
+from playwright._impl._driver import compute_driver_executable
+
+from pages.products_page import ADD_MANY_JS, product_slug
+
+# Minimal stand-in for the products grid: just what ADD_MANY_JS reads.
+FAKE_DOM = """
+const clicks = [];
+const button = (slug, b) => ({
+  textContent: "Add to Cart", disabled: !!b.disabled, style: b.style || {},
+  getAttribute: a => a === "aria-disabled" ? (b.ariaDisabled || null) : null,
+  scrollIntoView: () => {},
+  getBoundingClientRect: () => b.hidden ? { left: 0, top: 0, width: 0, height: 0 } : { left: 0, top: 0, width: 80, height: 20 },
+  contains: () => false,
+  click: () => clicks.push(slug),
+  covered: !!b.covered,
+});
+const tiles = Object.fromEntries(Object.entries(TILES).map(([slug, b]) => [slug, button(slug, b)]));
+let target = null;
+globalThis.CSS = { escape: s => s };
+globalThis.getComputedStyle = el => ({ visibility: "visible", pointerEvents: "auto", ...el.style });
+globalThis.document = {
+  querySelector: sel => {
+    const slug = sel.match(/product-(.*)"\\]$/)[1];
+    return tiles[slug] ? { querySelectorAll: () => [(target = tiles[slug])] } : null;
+  },
+  elementFromPoint: () => target.covered ? { overlay: true } : target,
+};
+"""
+
+
+def add_many(tiles, names):
+    items = [[name, product_slug(name)] for name in names]
+    script = (f"const TILES = {json.dumps(tiles)};\n{FAKE_DOM}\n"
+              f"const missed = ({ADD_MANY_JS})({{ items: {json.dumps(items)}, attr: 'data-testid' }});\n"
+              "console.log(JSON.stringify({ missed, clicks }));")
+    out = subprocess.run([compute_driver_executable()[0], "-e", script], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def test_clicks_each_product_once_and_leaves_repeats_to_playwright():
+    result = add_many({"backpack": {}, "bike-light": {}}, ["Backpack", "Bike Light", "Backpack"])
+    assert result == {"missed": ["Backpack"], "clicks": ["backpack", "bike-light"]}
+
+
+def test_unclickable_buttons_are_returned_not_clicked():
+    tiles = {"backpack": {}, "onesie": {"disabled": True}, "fleece": {"ariaDisabled": "true"},
+             "jacket": {"hidden": True}, "cap": {"style": {"visibility": "hidden"}}, "tee": {"covered": True}}
+    result = add_many(tiles, ["Backpack", "Onesie", "Fleece", "Jacket", "Cap", "Tee", "Missing"])
+    assert result == {"missed": ["Onesie", "Fleece", "Jacket", "Cap", "Tee", "Missing"], "clicks": ["backpack"]}
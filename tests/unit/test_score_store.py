@@ -0,0 +1,53 @@
+import json
+
+from locators import score_store
+from locators.score_store import ScoreStore
+
+
+def test_compact_merges_only_this_runs_logs(tmp_path, monkeypatch):
+    path = tmp_path / "locator_scores.json"
+    other = tmp_path / "locator_scores.other-run.999.log"
+    other.write_text(json.dumps({"t": "Login", "n": 5}) + "\n")
+
+    monkeypatch.setenv("PW_RUN_ID", "this-run")
+    worker = ScoreStore(path, flush_every=10_000)
+    worker.bump("Login", 2)
+    worker.flush()
+    assert worker.log_path.name.startswith("locator_scores.this-run.")
+    # a torn final line from a killed worker is skipped
+    worker.log_path.write_text(worker.log_path.read_text() + '{"t": "Lo')
+
+    merged = ScoreStore(path).compact()
+    assert merged["scores"] == {"Login": 2}
+    assert json.loads(path.read_text())["scores"] == {"Login": 2}
+    assert not worker.log_path.exists()
+    assert other.exists()
+
+
+def test_rank_prefers_cheap_reliable_strategies(tmp_path):
+    store = ScoreStore(tmp_path / "scores.json", flush_every=10_000)
+    key = "shop.test/cart|Checkout"
+    strategies = ["get_by_role", "get_by_test_id", "css"]
+    assert store.rank(key, strategies) == strategies  # unknown key keeps the caller's order
+    for _ in range(5):
+        store.record(key, "get_by_role", False, 2.0)
+        store.record(key, "get_by_test_id", True, 1.0)
+        store.record(key, "css", True, 4.0)
+    assert store.rank(key, strategies) == ["get_by_test_id", "css", "get_by_role"]
+
+
+def test_old_results_decay(tmp_path, monkeypatch):
+    store = ScoreStore(tmp_path / "scores.json", flush_every=10_000)
+    key = "shop.test/|Buy"
+    now = 1_000_000.0
+    monkeypatch.setattr(score_store.time, "time", lambda: now)
+    for _ in range(20):
+        store.record(key, "get_by_role", True, 1.0)
+    store.record(key, "get_by_text", True, 1.0)
+    assert store.rank(key, ["get_by_text", "get_by_role"]) == ["get_by_role", "get_by_text"]
+    # ten half-lives later get_by_role starts failing; its old wins no longer outweigh that
+    now += 10 * score_store.HALF_LIFE_SEC
+    for _ in range(3):
+        store.record(key, "get_by_role", False, 1.0)
+    assert store.stats[key]["get_by_role"]["w"] < 0.05
+    assert store.rank(key, ["get_by_role", "get_by_text"]) == ["get_by_text", "get_by_role"]
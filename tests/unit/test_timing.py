@@ -0,0 +1,72 @@
+import inspect
+
+import pytest
+
+from pages import timing
+from pages.timing import ActionRecorder, describe, step, timed
+
+
+class Page:
+    @timed("click")
+    def click(self, target):
+        return f"clicked {target}"
+
+    @timed("fill")
+    async def fill(self, target, value):
+        return value
+
+    @timed("fail")
+    def fail(self):
+        raise ValueError("boom")
+
+
+def finish(coro):
+    """Result of a coroutine that never suspends, without needing an event loop."""
+    with pytest.raises(StopIteration) as done:
+        coro.send(None)
+    return done.value.value
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    rec = ActionRecorder()
+    monkeypatch.setattr(timing, "_recorder", rec)
+    return rec
+
+
+def test_disabled_recorder_just_calls_through(monkeypatch):
+    monkeypatch.setattr(timing, "_recorder", None)
+    assert Page().click("Buy") == "clicked Buy"
+    assert finish(Page().fill("name", "Ada")) == "Ada"
+
+
+def test_sync_and_async_methods_are_recorded(recorder):
+    page = Page()
+    page.click("Buy")
+    page.click("Buy")
+    assert inspect.iscoroutinefunction(Page.fill)
+    assert finish(page.fill({"first": 1, "last": 2}, "Ada")) == "Ada"
+    with pytest.raises(ValueError):
+        page.fail()
+    samples = recorder.take()
+    assert sorted(samples) == [("Page", "click", "Buy"), ("Page", "fail", ""), ("Page", "fill", "first,last")]
+    assert len(samples[("Page", "click", "Buy")]) == 2
+    assert all(ms >= 0 for values in samples.values() for ms in values)
+    assert recorder.take() == {}
+
+
+def test_step_times_a_block(recorder):
+    with step("CheckoutFlow", "prepare_cart", "seeded"):
+        pass
+    assert list(recorder.take()) == [("CheckoutFlow", "prepare_cart", "seeded")]
+
+
+def test_describe():
+    class Locator:
+        def __repr__(self):
+            return "<Locator frame=<Frame name= url='about:blank'> selector='internal:testid=[data-testid=\"buy\"s]'>"
+
+    assert describe(Locator()) == 'internal:testid=[data-testid="buy"s]'
+    assert describe("https://shop.test") == "https://shop.test"
+    assert describe(42) == "int"
+    assert timing.bucket_label(10) == "<=10ms" and timing.bucket_label(float("inf")) == ">5000ms"
@@ -0,0 +1,71 @@
+"""Benchmark OpenAILikeProvider per-call latency against the local fake server.
+
+Compares a fresh ``httpx.Client`` per call (the old behaviour) with the
+provider's persistent keep-alive pool.  The fake runs in-process on a free
+port; plain HTTP on loopback, so real endpoints also save the TLS handshake
+on top of what is shown here.
+
+Usage: python tools/bench_ai_provider.py [calls] [fake latency ms]
+"""
+from __future__ import annotations
+import os
+import statistics
+import sys
+import tempfile
+import time
+import pathlib
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+from services.fakes.openai.app import start_in_thread  # noqa: E402
+
+
+def per_call_client(provider, prompt: str) -> None:
+    payload = {"model": provider.model, "messages": [{"role": "user", "content": prompt}],
+               "max_tokens": provider.max_tokens, "temperature": 0.0}
+    with httpx.Client(timeout=provider.timeout) as client:
+        client.post(f"{provider.base_url}/chat/completions", json=payload,
+                    headers={"Authorization": f"Bearer {provider.api_key}"}).raise_for_status()
+
+
+def measure(fn, calls: int) -> list:
+    samples = []
+    for i in range(calls):
+        t0 = time.perf_counter()
+        fn(f"summarize failure cluster {i}")
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def report(label: str, samples: list) -> None:
+    p95 = statistics.quantiles(samples, n=20)[-1]
+    print(f"{label:<22}: mean {statistics.mean(samples):7.2f} ms   p50 {statistics.median(samples):7.2f} ms"
+          f"   p95 {p95:7.2f} ms")
+
+
+def main() -> None:
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    os.environ["FAKE_OPENAI_LATENCY_MS"] = sys.argv[2] if len(sys.argv) > 2 else "0"
+    server, thread, port = start_in_thread()
+    os.environ.update({"AI_API_KEY": "fake", "AI_BASE_URL": f"http://127.0.0.1:{port}/v1",
+                       "AI_BUDGET_USD": "1000", "AI_AUDIT_LOG": os.devnull,
+                       "AI_BUDGET_LEDGER": os.path.join(tempfile.mkdtemp(), "ai_budget.sqlite")})
+    from ai.providers.openai_like import OpenAILikeProvider
+
+    provider = OpenAILikeProvider()
+    provider.chat("warm-up")
+    before = measure(lambda p: per_call_client(provider, p), calls)
+    after = measure(provider.chat, calls)
+    provider.close()
+    server.should_exit = True
+    thread.join()
+
+    report("client per call", before)
+    report("persistent pool", after)
+    print(f"{'speed-up (mean)':<22}: {statistics.mean(before) / statistics.mean(after):7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark tests/sec with and without the warm BrowserContext pool.
+
+Each simulated test opens a page, renders a small form, clicks a button and
+reads the result -- roughly the shape of a short E2E check -- so the numbers
+show how much of a test's wall time goes into context setup and teardown.
+
+Usage: python tools/bench_context_pool.py [iterations] [pool-size]
+"""
+from __future__ import annotations
+import sys
+import time
+import pathlib
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from playwright.sync_api import sync_playwright  # noqa: E402
+from plugins.context_pool import ContextPool  # noqa: E402
+
+HTML = """
+<form>
+  <input data-testid="name"><button type="button"
+    onclick="document.querySelector('#out').textContent = 'ok'">Go</button>
+  <div id="out"></div>
+</form>
+"""
+
+
+def one_test(pool: ContextPool) -> None:
+    context = pool.acquire()
+    page = context.new_page()
+    page.set_content(HTML)
+    page.get_by_test_id("name").fill("bench")
+    page.get_by_role("button", name="Go").click()
+    assert page.locator("#out").inner_text() == "ok"
+    pool.release(context)
+
+
+def run(browser, iterations: int, size: int) -> float:
+    pool = ContextPool(browser, size=size)
+    pool.warm()
+    one_test(pool)  # warm-up outside the timed window
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        one_test(pool)
+    elapsed = time.perf_counter() - t0
+    pool.close()
+    return iterations / elapsed
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        fresh = run(browser, iterations, 0)
+        pooled = run(browser, iterations, size)
+        browser.close()
+    print(f"fresh context per test : {fresh:7.1f} tests/sec")
+    print(f"pooled (size {size:<3})      : {pooled:7.1f} tests/sec")
+    print(f"speed-up               : {pooled / fresh:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Micro-benchmark SmartLocator lookups/sec against a static HTML page.
+
+Compares the sequential per-strategy ``count()`` path with the single
+in-page probe, for targets that resolve at different strategy depths:
+once for the match step alone (one ``probe()`` against a ``count()`` per
+strategy) and once end to end through ``find()``.
+
+Usage: python tools/bench_smart_locator.py [iterations]
+"""
+from __future__ import annotations
+import os
+import sys
+import time
+import pathlib
+import tempfile
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+# keep benchmark score writes out of the real artifacts
+os.environ.setdefault("LOCATOR_SCORES_PATH", str(pathlib.Path(tempfile.mkdtemp()) / "scores.json"))
+
+from playwright.sync_api import sync_playwright  # noqa: E402
+from locators.smart_locator import DEFAULT_STRATEGIES, SmartLocator  # noqa: E402
+
+ROWS = "\n".join(
+    f'<li data-testid="row-{i}"><span>Item {i}</span><button>Add {i}</button></li>' for i in range(200)
+)
+HTML = f"""
+<html><body>
+  <h1>Catalogue</h1>
+  <button aria-label="Sign In">→</button>
+  <a data-testid="cart-link" href="#">Cart</a>
+  <p>Free shipping over 50</p>
+  <div class="promo"><span id="promo-code">SAVE10</span></div>
+  <ul>{ROWS}</ul>
+</body></html>
+"""
+
+# target -> strategy that resolves it
+TARGETS = {
+    "Sign In": "get_by_role",
+    "cart-link": "get_by_test_id",
+    "Free shipping over 50": "get_by_text",
+    "div.promo > #promo-code": "css",
+    "//ul/li[last()]/span": "xpath",
+}
+
+
+def bench_match(page, probe_in_page: bool, iterations: int) -> float:
+    """Lookups/sec for matching all strategies, without ranking or scoring."""
+    smart = SmartLocator(page, ai_enabled=False)
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        for target in TARGETS:
+            if probe_in_page:
+                smart.probe(target, DEFAULT_STRATEGIES)
+            else:
+                for strat in DEFAULT_STRATEGIES:
+                    try:
+                        smart._build(strat, target).count()
+                    except Exception:  # e.g. a text target is not valid CSS
+                        pass
+    return iterations * len(TARGETS) / (time.perf_counter() - t0)
+
+
+def bench(page, probe_in_page: bool, iterations: int) -> float:
+    smart = SmartLocator(page, ai_enabled=False, probe_in_page=probe_in_page)
+    for target in TARGETS:
+        assert smart.find(target) is not None, target
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        for target in TARGETS:
+            smart.find(target)
+    return iterations * len(TARGETS) / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        page.set_content(HTML)
+        rows = [
+            ("match", bench_match(page, False, iterations), bench_match(page, True, iterations)),
+            ("find()", bench(page, False, iterations), bench(page, True, iterations)),
+        ]
+        browser.close()
+    for label, sequential, probed in rows:
+        print(f"{label:<7} sequential count() : {sequential:8.1f} lookups/sec")
+        print(f"{label:<7} single probe       : {probed:8.1f} lookups/sec")
+        print(f"{label:<7} speed-up           : {probed / sequential:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()